@@ -0,0 +1,68 @@
+"""
+Versioned page caching shared by the apps.
+
+A view is cached per URL (including the query string) under a key prefix that
+carries a version number kept in the cache itself. Bumping the version makes
+every page cached under the old prefix unreachable, and those entries expire
+on their own timeout, so no key ever has to be deleted.
+"""
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
+
+
+def get_cache_version(version_key):
+    """Return the version stored under version_key, starting a new one if none is cached"""
+    return cache.get_or_set(version_key, time.time_ns, None)
+
+
+def bump_cache_version(version_key):
+    """Invalidate every page cached under version_key's current version"""
+    cache.set(version_key, time.time_ns(), None)
+
+
+def versioned_cache_page(timeout, version_key, key_prefix):
+    """
+    Like cache_page(timeout), but keyed under f'{key_prefix}.{version}'.
+
+    The cache_page wrapper is rebuilt only when the version changes.
+    """
+    def decorator(view_func):
+        cached = (None, None)  # (version, cache_page-wrapped view), swapped as one tuple
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            nonlocal cached
+            version = get_cache_version(version_key)
+            cached_version, cached_view = cached
+            if cached_version != version:
+                cached_view = cache_page(timeout, key_prefix=f'{key_prefix}.{version}')(view_func)
+                cached = (version, cached_view)
+            return cached_view(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+
+def cache_per_cookie(cache_decorator):
+    """
+    Cache an HTML view with cache_decorator, separately for each visitor's cookies.
+
+    base.html renders the signed-in user's menu and CSRF tokens. A page rendered
+    for a request without a CSRF cookie carries a token for a cookie that is only
+    set on that response, so such requests bypass the cache.
+    """
+    def decorator(view_func):
+        view_func = vary_on_cookie(view_func)
+        cached_view = cache_decorator(view_func)
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if settings.CSRF_COOKIE_NAME not in request.COOKIES:
+                return view_func(request, *args, **kwargs)
+            return cached_view(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
@@ -16,6 +16,14 @@ try:
     import dj_database_url  # optional, used only when DATABASE_URL is set
 except Exception:
     dj_database_url = None
+try:
+    import whitenoise  # optional, serves compressed static files when installed
+except ImportError:
+    whitenoise = None
+try:
+    import cachalot  # optional, caches ORM query results when installed
+except ImportError:
+    cachalot = None
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -83,6 +91,10 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if whitenoise:
+    # Must sit directly after SecurityMiddleware
+    MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")
+
 ROOT_URLCONF = "agro_main.urls"
 
 TEMPLATES = [
@@ -119,6 +131,31 @@ else:
     }
 
 
+# Cache (shared Redis in production, per-process memory otherwise)
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Query result cache: results are keyed by the tables they read and dropped
+# on any write to those tables. Sessions change on almost every request.
+# Only used with Redis: with a per-process LocMemCache a write would only
+# invalidate the worker that made it, and the others would keep stale results.
+if cachalot and REDIS_URL:
+    INSTALLED_APPS.append('cachalot')
+CACHALOT_ENABLED = bool(REDIS_URL) and os.getenv("CACHALOT_ENABLED", "True").lower() in ['true', '1', 'yes']
+CACHALOT_UNCACHABLE_TABLES = frozenset(("django_migrations", "django_session"))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -182,12 +219,22 @@ STATICFILES_DIRS = [BASE_DIR / "static"] if (BASE_DIR / "static").exists() else
 # Media files (Azure Blob optional)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+MEDIA_STORAGE_BACKEND = "django.core.files.storage.FileSystemStorage"
 if os.getenv("AZURE_ACCOUNT_NAME") and os.getenv("AZURE_ACCOUNT_KEY") and os.getenv("AZURE_MEDIA_CONTAINER"):
-    DEFAULT_FILE_STORAGE = "storages.backends.azure_storage.AzureStorage"
+    DEFAULT_FILE_STORAGE = MEDIA_STORAGE_BACKEND = "storages.backends.azure_storage.AzureStorage"
     AZURE_ACCOUNT_NAME = os.getenv("AZURE_ACCOUNT_NAME")
     AZURE_ACCOUNT_KEY = os.getenv("AZURE_ACCOUNT_KEY")
     AZURE_CONTAINER = os.getenv("AZURE_MEDIA_CONTAINER")
 
+# Pre-compressed (gzip/brotli), content-hashed static files served by WhiteNoise
+# with far-future cache headers. The manifest only exists after collectstatic,
+# so it is used outside of DEBUG only.
+if whitenoise and not DEBUG:
+    STORAGES = {
+        "default": {"BACKEND": MEDIA_STORAGE_BACKEND},
+        "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+    }
+
 # Quill Editor Configuration (Modern Rich Text Editor)
 QUILL_CONFIGS = {
     'default': {
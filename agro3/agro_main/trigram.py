@@ -0,0 +1,30 @@
+"""
+pg_trgm indexes for icontains searches, shared by the apps' migrations.
+
+icontains compiles to UPPER("column"::text) LIKE UPPER(%s), so each index is
+built on that exact expression. Other databases are left untouched.
+"""
+
+
+def index_name(table, column):
+    return f"{table}_{column}_trgm"
+
+
+def create_trigram_indexes(schema_editor, columns):
+    """Add a pg_trgm GIN index for each (table, column) pair"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in columns:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{index_name(table, column)}" '
+            f'ON "{table}" USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(schema_editor, columns):
+    """Remove the pg_trgm indexes (the extension is left installed)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in columns:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{index_name(table, column)}"')
@@ -11,20 +11,24 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
 from django.shortcuts import render
+from django.views.generic import TemplateView
+from django.views.decorators.cache import cache_page
+from agro_main.caching import cache_per_cookie
 from locations.views import GetRegionsView, GetCitiesView, SearchLocationsView
+from locations import urls as locations_urls
+from users import urls as users_urls, api_urls as users_api_urls
+from crops import urls as crops_urls
+from pests_diseases import urls as pests_diseases_urls
+from market import urls as market_urls
+from forum import urls as forum_urls
+from weather import urls as weather_urls
+from agro_supplies import urls as agro_supplies_urls
 
 
-def home_view(request):
-    """
-    Display the home page.
-    
-    Handles GET requests to render the main landing page of the agricultural
-    application with links to all major features.
-    
-    Returns:
-        Rendered home page template
-    """
-    return render(request, 'home.html')
+# Home page: the main landing page with links to all major features. Served by
+# TemplateView (lazy TemplateResponse) and cached for an hour per visitor's
+# cookies, since base.html renders the user's navbar and CSRF tokens.
+home_view = cache_per_cookie(cache_page(60 * 60))(TemplateView.as_view(template_name='home.html'))
 
 
 def location_test_view(request):
@@ -32,12 +36,10 @@ def location_test_view(request):
     return render(request, 'location_test.html')
 
 
-from locations.views import LocationSearchPageView
-
 # Language-independent URLs (API endpoints, media files, etc.)
 urlpatterns = [
     path('i18n/', include('django.conf.urls.i18n')),  # Language switcher
-    path('api/users/', include('users.api_urls')),
+    path('api/users/', include(users_api_urls)),
     path('locations/ajax/', include([
         path('regions/', GetRegionsView.as_view(), name='api_get_regions'),
         path('cities/', GetCitiesView.as_view(), name='api_get_cities'),
@@ -50,15 +52,15 @@ urlpatterns += i18n_patterns(
     path('admin/', admin.site.urls),
     path('', home_view, name='home'),
     path('location-test/', location_test_view, name='location_test'),
-    path('locations/', include('locations.urls')),  # Regular location pages with language prefixes
-    path('users/', include('users.urls')),
-    path('crops/', include('crops.urls')),
-    path('pests-diseases/', include('pests_diseases.urls')),
-    path('market/', include('market.urls')),
+    path('locations/', include(locations_urls)),  # Regular location pages with language prefixes
+    path('users/', include(users_urls)),
+    path('crops/', include(crops_urls)),
+    path('pests-diseases/', include(pests_diseases_urls)),
+    path('market/', include(market_urls)),
 
-    path('forum/', include('forum.urls')),
-    path('weather/', include('weather.urls')),
-    path('agro-supplies/', include('agro_supplies.urls')),
+    path('forum/', include(forum_urls)),
+    path('weather/', include(weather_urls)),
+    path('agro-supplies/', include(agro_supplies_urls)),
     path('ckeditor/', include('ckeditor_uploader.urls')),  # Temporarily kept for compatibility
     prefix_default_language=True,  # Include language prefix for default language too
 )
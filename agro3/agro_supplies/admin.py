@@ -1,4 +1,10 @@
+from decimal import Decimal
+
 from django.contrib import admin
+from django.db import transaction
+from django.utils import timezone
+from .caching import bump_catalog_version
+from .price_stats import refresh_price_stats
 from .models import ChemicalCategory, ChemicalProduct, Shop, ChemicalPrice, PriceHistory
 
 
@@ -14,6 +20,7 @@ class ChemicalCategoryAdmin(admin.ModelAdmin):
 class ChemicalProductAdmin(admin.ModelAdmin):
     list_display = ('name', 'brand', 'category', 'package_size', 'package_unit', 'is_active')
     list_filter = ('category', 'brand', 'application_method', 'is_active', 'created_at')
+    list_select_related = ('category',)
     search_fields = ('name', 'brand', 'active_ingredient', 'target_crops')
     readonly_fields = ('created_at', 'updated_at')
     fieldsets = (
@@ -43,6 +50,7 @@ class ChemicalProductAdmin(admin.ModelAdmin):
 class ShopAdmin(admin.ModelAdmin):
     list_display = ('name', 'shop_type', 'get_location_display', 'phone_number', 'whatsapp_number', 'is_active', 'is_verified')
     list_filter = ('shop_type', 'country', 'region', 'is_active', 'is_verified', 'delivery_available')
+    list_select_related = ('country', 'region', 'city')
     search_fields = ('name', 'owner_name', 'phone_number', 'whatsapp_number', 'email', 'address')
     readonly_fields = ('created_at', 'updated_at')
     fieldsets = (
@@ -73,14 +81,20 @@ class PriceHistoryInline(admin.TabularInline):
     extra = 0
     readonly_fields = ('change_date', 'changed_by')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('changed_by')
+
 
 @admin.register(ChemicalPrice)
 class ChemicalPriceAdmin(admin.ModelAdmin):
     list_display = ('product', 'shop', 'price', 'currency', 'is_in_stock', 'last_updated')
     list_filter = ('currency', 'is_in_stock', 'product__category', 'shop__shop_type', 'last_updated')
+    # Shop.__str__ walks the shop's city/region/country
+    list_select_related = ('product', 'shop__country', 'shop__region', 'shop__city')
     search_fields = ('product__name', 'product__brand', 'shop__name')
     readonly_fields = ('last_updated',)
     inlines = [PriceHistoryInline]
+    actions = ['raise_prices_5_percent', 'lower_prices_5_percent']
     fieldsets = (
         ('Product & Shop', {
             'fields': ('product', 'shop')
@@ -102,14 +116,57 @@ class ChemicalPriceAdmin(admin.ModelAdmin):
             obj.updated_by = request.user
         super().save_model(request, obj, form, change)
 
+    def update_prices_bulk(self, request, queryset, factor, reason):
+        """
+        Multiply the selected prices by factor and record the change history.
+
+        All rows are written with one bulk UPDATE and one bulk INSERT of
+        PriceHistory instead of a save() per row.
+        """
+        now = timezone.now()
+        prices = list(queryset)
+        history = []
+        for chemical_price in prices:
+            new_price = (chemical_price.price * factor).quantize(Decimal('0.01'))
+            history.append(PriceHistory(
+                chemical_price=chemical_price,
+                old_price=chemical_price.price,
+                new_price=new_price,
+                changed_by=request.user,
+                reason=reason,
+            ))
+            chemical_price.price = new_price
+            chemical_price.updated_by = request.user
+            # bulk_update() bypasses auto_now
+            chemical_price.last_updated = now
+
+        with transaction.atomic():
+            ChemicalPrice.objects.bulk_update(prices, ['price', 'updated_by', 'last_updated'])
+            PriceHistory.objects.bulk_create(history)
+        # bulk_update() sends no post_save signals
+        refresh_price_stats({chemical_price.product_id for chemical_price in prices})
+        bump_catalog_version()
+
+        self.message_user(request, f"Updated {len(prices)} price(s).")
+
+    @admin.action(description="Raise selected prices by 5%%")
+    def raise_prices_5_percent(self, request, queryset):
+        self.update_prices_bulk(request, queryset, Decimal('1.05'), "Bulk increase of 5%")
+
+    @admin.action(description="Lower selected prices by 5%%")
+    def lower_prices_5_percent(self, request, queryset):
+        self.update_prices_bulk(request, queryset, Decimal('0.95'), "Bulk decrease of 5%")
+
 
 @admin.register(PriceHistory)
 class PriceHistoryAdmin(admin.ModelAdmin):
     list_display = ('chemical_price', 'old_price', 'new_price', 'get_change_percentage', 'change_date', 'changed_by')
     list_filter = ('change_date', 'chemical_price__product__category')
+    # ChemicalPrice.__str__ reads both product and shop names
+    list_select_related = ('chemical_price__product', 'chemical_price__shop', 'changed_by')
     search_fields = ('chemical_price__product__name', 'chemical_price__shop__name', 'reason')
     readonly_fields = ('change_date',)
-    
+
     def get_change_percentage(self, obj):
         change = obj.get_change_percentage()
         return f"{change:.1f}%" if change else "0%"
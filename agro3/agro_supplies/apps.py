@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AgroSuppliesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "agro_supplies"
+
+    def ready(self):
+        import agro_supplies.signals
@@ -0,0 +1,32 @@
+"""
+Page caching for the agro supplies catalog.
+
+Any change to categories, products, shops or prices bumps the catalog version
+(see signals.py), which retires every cached catalog page at once.
+"""
+from agro_main.caching import bump_cache_version, cache_per_cookie, get_cache_version, versioned_cache_page
+
+CATALOG_CACHE_TIMEOUT = 60 * 5
+CATALOG_VERSION_KEY = 'agro_supplies:catalog_version'
+
+# Catalog JSON endpoints; their payload is the same for every user
+cache_catalog_api = versioned_cache_page(CATALOG_CACHE_TIMEOUT, CATALOG_VERSION_KEY, 'agro_supplies')
+
+
+def get_catalog_version():
+    """Return the current catalog version"""
+    return get_cache_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog page"""
+    bump_cache_version(CATALOG_VERSION_KEY)
+
+
+def cache_catalog_page(view_func):
+    """
+    Cache a catalog view's response until it times out or the catalog changes.
+
+    Pages are cached per visitor's cookies (see cache_per_cookie).
+    """
+    return cache_per_cookie(cache_catalog_api)(view_func)
@@ -1,15 +1,49 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.contrib.auth.models import User
 from locations.models import Country, Region, City
+from agro_supplies.caching import bump_catalog_version
+from agro_supplies.price_stats import refresh_price_stats
 from agro_supplies.models import ChemicalCategory, ChemicalProduct, Shop, ChemicalPrice
 from decimal import Decimal
+import random
 
 
 class Command(BaseCommand):
     help = 'Create sample chemical products and shops data'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Random seed for reproducible prices and shop assignments',
+        )
+
+    def bulk_get_or_create(self, queryset, key, candidates, batch_size=None):
+        """
+        Insert the candidates whose key is not yet in the queryset.
+
+        Existing rows are loaded with one SELECT and the missing ones are written
+        with one bulk INSERT, instead of a get_or_create round-trip per row.
+
+        Returns:
+            Tuple of (dict of all rows keyed by key(obj), list of newly created objects)
+        """
+        existing = {key(obj): obj for obj in queryset}
+        missing = {}
+        for obj in candidates:
+            if key(obj) not in existing:
+                missing.setdefault(key(obj), obj)
+        if not missing:
+            return existing, []
+        queryset.model.objects.bulk_create(missing.values(), batch_size=batch_size, ignore_conflicts=True)
+        # Re-read so every row (old and new) carries its primary key
+        return {key(obj): obj for obj in queryset.all()}, list(missing.values())
+
+    @transaction.atomic
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('Creating sample agro supplies data...'))
+        rng = random.Random(options['seed'])
         
         # Create categories
         categories_data = [
@@ -21,16 +55,16 @@ class Command(BaseCommand):
             ('insecticide', 'Contact Insecticides', 'Fast-acting insect control products'),
         ]
         
-        categories = {}
-        for cat_type, name, desc in categories_data:
-            category, created = ChemicalCategory.objects.get_or_create(
-                name=name,
-                category_type=cat_type,
-                defaults={'description': desc}
-            )
-            categories[name] = category
-            if created:
-                self.stdout.write(f'Created category: {category}')
+        category_names = [name for _, name, _ in categories_data]
+        categories_by_key, new_categories = self.bulk_get_or_create(
+            ChemicalCategory.objects.filter(name__in=category_names),
+            lambda c: (c.name, c.category_type),
+            [ChemicalCategory(name=name, category_type=cat_type, description=desc)
+             for cat_type, name, desc in categories_data],
+        )
+        for category in new_categories:
+            self.stdout.write(f'Created category: {category}')
+        categories = {name: categories_by_key[(name, cat_type)] for cat_type, name, _ in categories_data}
         
         # Create chemical products
         products_data = [
@@ -75,60 +109,59 @@ class Command(BaseCommand):
              '3-4g/L', 'spray', 1, 'kg', 'Citrus, Vegetables, Grapes', 'Bacterial spot, Canker'),
         ]
         
-        created_products = []
-        for product_data in products_data:
-            product, created = ChemicalProduct.objects.get_or_create(
-                name=product_data[0],
-                brand=product_data[1],
-                package_size=product_data[9],
-                package_unit=product_data[10],
-                defaults={
-                    'category': product_data[2],
-                    'active_ingredient': product_data[3],
-                    'concentration': product_data[4],
-                    'description': product_data[5],
-                    'usage_instructions': product_data[6],
-                    'dosage': product_data[7],
-                    'application_method': product_data[8],
-                    'target_crops': product_data[11],
-                    'target_pests': product_data[12],
-                    'safety_warnings': 'Follow label instructions. Use protective equipment.',
-                }
-            )
-            created_products.append(product)
-            if created:
-                self.stdout.write(f'Created product: {product}')
+        product_key = lambda p: (p.name, p.brand, p.package_size, p.package_unit)
+        products_by_key, new_products = self.bulk_get_or_create(
+            ChemicalProduct.objects.select_related('category').filter(
+                name__in=[data[0] for data in products_data]
+            ),
+            product_key,
+            [
+                ChemicalProduct(
+                    name=product_data[0],
+                    brand=product_data[1],
+                    package_size=Decimal(product_data[9]),
+                    package_unit=product_data[10],
+                    category=product_data[2],
+                    active_ingredient=product_data[3],
+                    concentration=product_data[4],
+                    description=product_data[5],
+                    usage_instructions=product_data[6],
+                    dosage=product_data[7],
+                    application_method=product_data[8],
+                    target_crops=product_data[11],
+                    target_pests=product_data[12],
+                    safety_warnings='Follow label instructions. Use protective equipment.',
+                )
+                for product_data in products_data
+            ],
+        )
+        for product in new_products:
+            self.stdout.write(f'Created product: {product}')
+        created_products = [
+            products_by_key[(data[0], data[1], Decimal(data[9]), data[10])] for data in products_data
+        ]
         
         # Get or create countries and locations
-        try:
-            kyrgyzstan = Country.objects.get(name='Kyrgyzstan')
-        except Country.DoesNotExist:
-            kyrgyzstan = Country.objects.create(name='Kyrgyzstan', code='KG')
-        
-        try:
-            russia = Country.objects.get(name='Russia')
-        except Country.DoesNotExist:
-            russia = Country.objects.create(name='Russia', code='RU')
+        countries_data = {'Kyrgyzstan': 'KG', 'Russia': 'RU'}
+        countries, _ = self.bulk_get_or_create(
+            Country.objects.filter(name__in=countries_data),
+            lambda c: c.name,
+            [Country(name=name, code=code) for name, code in countries_data.items()],
+        )
+        kyrgyzstan = countries['Kyrgyzstan']
+        russia = countries['Russia']
         
-        # Create regions for Kyrgyzstan
+        # Create regions for Kyrgyzstan and Russia
         regions_kg = ['Chuy', 'Issyk-Kul', 'Naryn', 'Talas', 'Osh', 'Jalal-Abad', 'Batken']
-        kg_regions = []
-        for region_name in regions_kg:
-            region, created = Region.objects.get_or_create(
-                name=region_name, 
-                country=kyrgyzstan
-            )
-            kg_regions.append(region)
-        
-        # Create regions for Russia
         regions_ru = ['Moscow Oblast', 'Saint Petersburg', 'Krasnodar Krai', 'Rostov Oblast']
-        ru_regions = []
-        for region_name in regions_ru:
-            region, created = Region.objects.get_or_create(
-                name=region_name, 
-                country=russia
-            )
-            ru_regions.append(region)
+        regions_by_key, _ = self.bulk_get_or_create(
+            Region.objects.filter(country__in=[kyrgyzstan, russia]),
+            lambda r: (r.country_id, r.name),
+            [Region(name=name, country=kyrgyzstan) for name in regions_kg]
+            + [Region(name=name, country=russia) for name in regions_ru],
+        )
+        kg_regions = [regions_by_key[(kyrgyzstan.pk, name)] for name in regions_kg]
+        ru_regions = [regions_by_key[(russia.pk, name)] for name in regions_ru]
         
         # Create cities
         cities_data = [
@@ -139,13 +172,14 @@ class Command(BaseCommand):
             ('Krasnodar', ru_regions[2]),
         ]
         
-        cities = []
-        for city_name, region in cities_data:
-            city, created = City.objects.get_or_create(
-                name=city_name,
-                region=region
-            )
-            cities.append(city)
+        cities_by_key, _ = self.bulk_get_or_create(
+            City.objects.select_related('region__country').filter(
+                region__in=[region for _, region in cities_data]
+            ),
+            lambda c: (c.region_id, c.name),
+            [City(name=city_name, region=region) for city_name, region in cities_data],
+        )
+        cities = [cities_by_key[(region.pk, city_name)] for city_name, region in cities_data]
         
         # Create shops
         shops_data = [
@@ -165,32 +199,33 @@ class Command(BaseCommand):
              cities[4], 'Krasnaya Street 89, Krasnodar', 'Mon-Sat: 8AM-8PM'),
         ]
         
-        created_shops = []
-        for shop_data in shops_data:
-            city = shop_data[5]
-            shop, created = Shop.objects.get_or_create(
-                name=shop_data[0],
-                defaults={
-                    'shop_type': shop_data[1],
-                    'owner_name': shop_data[2],
-                    'phone_number': shop_data[3],
-                    'email': shop_data[4],
-                    'country': city.region.country,
-                    'region': city.region,
-                    'city': city,
-                    'address': shop_data[6],
-                    'working_hours': shop_data[7],
-                    'delivery_available': True,
-                    'delivery_radius_km': 50,
-                    'is_verified': True,
-                }
-            )
-            created_shops.append(shop)
-            if created:
-                self.stdout.write(f'Created shop: {shop}')
+        shops_by_name, new_shops = self.bulk_get_or_create(
+            Shop.objects.filter(name__in=[data[0] for data in shops_data]),
+            lambda shop: shop.name,
+            [
+                Shop(
+                    name=shop_data[0],
+                    shop_type=shop_data[1],
+                    owner_name=shop_data[2],
+                    phone_number=shop_data[3],
+                    email=shop_data[4],
+                    country=shop_data[5].region.country,
+                    region=shop_data[5].region,
+                    city=shop_data[5],
+                    address=shop_data[6],
+                    working_hours=shop_data[7],
+                    delivery_available=True,
+                    delivery_radius_km=50,
+                    is_verified=True,
+                )
+                for shop_data in shops_data
+            ],
+        )
+        for shop in new_shops:
+            self.stdout.write(f'Created shop: {shop}')
+        created_shops = [shops_by_name[data[0]] for data in shops_data]
         
         # Create prices for products in shops
-        import random
         base_prices = {
             'fertilizer': (800, 1500),  # KGS per 25-50kg
             'pesticide': (1200, 2500),  # KGS per liter
@@ -198,32 +233,42 @@ class Command(BaseCommand):
             'fungicide': (900, 2000),   # KGS per kg
         }
         
+        price_candidates = []
         for product in created_products:
             # Each product available in 2-4 random shops
-            available_shops = random.sample(created_shops, random.randint(2, 4))
+            available_shops = rng.sample(created_shops, rng.randint(2, 4))
             
             price_range = base_prices.get(product.category.category_type, (500, 2000))
-            base_price = random.randint(price_range[0], price_range[1])
+            base_price = rng.randint(price_range[0], price_range[1])
             
             for shop in available_shops:
                 # Vary price by shop (±20%)
-                variation = random.uniform(0.8, 1.2)
+                variation = rng.uniform(0.8, 1.2)
                 shop_price = int(base_price * variation)
                 
-                price, created = ChemicalPrice.objects.get_or_create(
+                price_candidates.append(ChemicalPrice(
                     product=product,
                     shop=shop,
-                    defaults={
-                        'price': Decimal(str(shop_price)),
-                        'currency': 'KGS',
-                        'discount_percentage': random.choice([0, 5, 10, 15]),
-                        'is_in_stock': random.choice([True, True, True, False]),  # 75% in stock
-                        'stock_quantity': random.randint(5, 100),
-                        'minimum_order': random.randint(1, 5),
-                    }
-                )
-                if created:
-                    self.stdout.write(f'Created price: {price}')
+                    price=Decimal(str(shop_price)),
+                    currency='KGS',
+                    discount_percentage=rng.choice([0, 5, 10, 15]),
+                    is_in_stock=rng.choice([True, True, True, False]),  # 75% in stock
+                    stock_quantity=rng.randint(5, 100),
+                    minimum_order=rng.randint(1, 5),
+                ))
+        
+        _, new_prices = self.bulk_get_or_create(
+            ChemicalPrice.objects.filter(product__in=created_products, shop__in=created_shops),
+            lambda price: (price.product_id, price.shop_id),
+            price_candidates,
+            batch_size=500,
+        )
+        for price in new_prices:
+            self.stdout.write(f'Created price: {price}')
+        
+        # bulk_create() sends no post_save signals
+        refresh_price_stats(product.pk for product in created_products)
+        bump_catalog_version()
         
         self.stdout.write(
             self.style.SUCCESS(
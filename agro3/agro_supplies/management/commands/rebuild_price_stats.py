@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from agro_supplies.caching import bump_catalog_version
+from agro_supplies.price_stats import refresh_price_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-product price statistics from current prices'
+
+    def handle(self, *args, **options):
+        count = refresh_price_stats()
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt price stats for {count} products'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agro_supplies', '0002_add_shop_contact_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chemicalprice',
+            index=models.Index(fields=['is_in_stock', '-last_updated'], name='agro_suppli_is_in_s_50d3bd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pricehistory',
+            index=models.Index(fields=['chemical_price', '-change_date'], name='agro_suppli_chemica_bbf8aa_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agro_supplies', '0003_chemicalprice_pricehistory_indexes'),
+        ('locations', '0002_alter_city_unique_together_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chemicalprice',
+            index=models.Index(fields=['product', 'price'], name='agro_suppli_product_1916b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chemicalprice',
+            index=models.Index(fields=['shop', 'is_in_stock'], name='agro_suppli_shop_id_b6602f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chemicalproduct',
+            index=models.Index(fields=['is_active', 'category'], name='agro_suppli_is_acti_b8b0ef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chemicalproduct',
+            index=models.Index(fields=['brand', 'name'], name='agro_suppli_brand_4efe0d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shop',
+            index=models.Index(fields=['is_active', 'country', 'region', 'city'], name='agro_suppli_is_acti_77245f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shop',
+            index=models.Index(fields=['shop_type', 'is_active'], name='agro_suppli_shop_ty_24b80c_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:51
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count, Max, Min
+
+
+def fill_price_stats(apps, schema_editor):
+    """Build the stats rows for existing prices, as refresh_price_stats() does"""
+    ChemicalPrice = apps.get_model('agro_supplies', 'ChemicalPrice')
+    ProductPriceStats = apps.get_model('agro_supplies', 'ProductPriceStats')
+    rows = ChemicalPrice.objects.values('product_id').annotate(
+        min_price=Min('price'),
+        max_price=Max('price'),
+        avg_price=Avg('price'),
+        shop_count=Count('shop', distinct=True)
+    ).order_by()
+    ProductPriceStats.objects.bulk_create(
+        [
+            ProductPriceStats(
+                product_id=row['product_id'],
+                min_price=row['min_price'],
+                max_price=row['max_price'],
+                avg_price=row['avg_price'].quantize(Decimal('0.01')),
+                shop_count=row['shop_count'],
+            )
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agro_supplies', '0004_add_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductPriceStats',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='price_stats', serialize=False, to='agro_supplies.chemicalproduct')),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('avg_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('shop_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Product Price Stats',
+            },
+        ),
+        migrations.RunPython(fill_price_stats, migrations.RunPython.noop),
+    ]
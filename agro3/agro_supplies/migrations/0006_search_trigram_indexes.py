@@ -0,0 +1,36 @@
+# Adds pg_trgm indexes for the icontains search columns (PostgreSQL only)
+
+from django.db import migrations
+
+from agro_main import trigram
+
+
+# Columns searched with icontains in product_list, shop_list and shop_detail
+SEARCH_COLUMNS = [
+    ('agro_supplies_chemicalproduct', 'name'),
+    ('agro_supplies_chemicalproduct', 'brand'),
+    ('agro_supplies_chemicalproduct', 'active_ingredient'),
+    ('agro_supplies_chemicalproduct', 'target_crops'),
+    ('agro_supplies_shop', 'name'),
+    ('agro_supplies_shop', 'owner_name'),
+    ('agro_supplies_shop', 'address'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    trigram.create_trigram_indexes(schema_editor, SEARCH_COLUMNS)
+
+
+def drop_indexes(apps, schema_editor):
+    trigram.drop_trigram_indexes(schema_editor, SEARCH_COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agro_supplies', '0005_productpricestats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
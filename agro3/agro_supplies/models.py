@@ -1,6 +1,8 @@
 from django.db import models
+from django.db.models.functions import Cast
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils.functional import cached_property
 from locations.models import Country, Region, City
 from decimal import Decimal
 
@@ -83,6 +85,10 @@ class ChemicalProduct(models.Model):
     class Meta:
         ordering = ['category', 'brand', 'name']
         unique_together = ['name', 'brand', 'package_size', 'package_unit']
+        indexes = [
+            models.Index(fields=['is_active', 'category']),
+            models.Index(fields=['brand', 'name']),
+        ]
     
     def __str__(self):
         return f"{self.brand} {self.name} ({self.package_size}{self.package_unit})"
@@ -90,26 +96,29 @@ class ChemicalProduct(models.Model):
     def get_absolute_url(self):
         return reverse('agro_supplies:product_detail', kwargs={'pk': self.pk})
     
+    LIQUID_UNITS = ['liter', 'ml']
+    LIQUID_INDICATORS = ['EC', 'SL', 'SC', 'AS']  # Common liquid formulation codes
+    
+    @cached_property
     def is_liquid(self):
         """Determine if product is liquid based on unit and concentration"""
-        liquid_units = ['liter', 'ml']
-        liquid_indicators = ['EC', 'SL', 'SC', 'AS']  # Common liquid formulation codes
-        
         # Check if unit indicates liquid
-        if self.package_unit in liquid_units:
+        if self.package_unit in self.LIQUID_UNITS:
             return True
         
         # Check concentration for liquid indicators
         concentration_upper = self.concentration.upper()
-        return any(indicator in concentration_upper for indicator in liquid_indicators)
+        return any(indicator in concentration_upper for indicator in self.LIQUID_INDICATORS)
     
+    @cached_property
     def get_standard_unit(self):
         """Get the standard unit for pricing (som per liter or som per kg)"""
-        return "liter" if self.is_liquid() else "kg"
+        return "liter" if self.is_liquid else "kg"
     
+    @cached_property
     def get_standard_unit_display(self):
         """Get display text for standard unit"""
-        return "som/liter" if self.is_liquid() else "som/kg"
+        return "som/liter" if self.is_liquid else "som/kg"
 
 
 class Shop(models.Model):
@@ -160,31 +169,67 @@ class Shop(models.Model):
     
     class Meta:
         ordering = ['country', 'region', 'city', 'name']
+        indexes = [
+            models.Index(fields=['is_active', 'country', 'region', 'city']),
+            models.Index(fields=['shop_type', 'is_active']),
+        ]
     
     def __str__(self):
-        location = []
-        if self.city:
-            location.append(self.city.name)
-        if self.region:
-            location.append(self.region.name)
-        if self.country:
-            location.append(self.country.name)
-        
-        location_str = ", ".join(location) if location else "Unknown Location"
-        return f"{self.name} ({location_str})"
+        return f"{self.name} ({self.get_location_display})"
     
     def get_absolute_url(self):
         return reverse('agro_supplies:shop_detail', kwargs={'pk': self.pk})
     
+    @cached_property
     def get_location_display(self):
-        """Get formatted location string"""
+        """
+        Get formatted location string.
+
+        Cached per instance; code that reassigns country/region/city must
+        ``del shop.get_location_display`` to refresh it.
+        """
         parts = []
         if self.city:
             parts.append(self.city.name)
         if self.region:
             parts.append(self.region.name)
-        parts.append(self.country.name)
-        return ", ".join(parts)
+        if self.country_id:
+            parts.append(self.country.name)
+        return ", ".join(parts) if parts else "Unknown Location"
+
+
+class ChemicalPriceQuerySet(models.QuerySet):
+    def with_standardized_price(self):
+        """
+        Annotate each price with standardized_price, computed in SQL.
+
+        Mirrors ChemicalPrice.get_standardized_price(): the effective (discounted)
+        price divided by the package size in liters for liquids or kg for solids.
+        The arithmetic is done in floating point because SQLite casts whole
+        decimals to integers and would otherwise divide them as integers.
+        """
+        float_field = models.FloatField()
+        price = Cast('price', float_field)
+        package_size = Cast('product__package_size', float_field)
+        is_liquid = models.Q(product__package_unit__in=ChemicalProduct.LIQUID_UNITS)
+        for indicator in ChemicalProduct.LIQUID_INDICATORS:
+            is_liquid |= models.Q(product__concentration__icontains=indicator)
+        
+        effective_price = price - price * Cast('discount_percentage', float_field) / 100.0
+        standard_size = models.Case(
+            # ml is always a liquid unit; grams only convert for solids
+            models.When(product__package_unit='ml', then=package_size / 1000.0),
+            models.When(models.Q(product__package_unit='gram') & ~is_liquid, then=package_size / 1000.0),
+            default=package_size,
+            output_field=float_field,
+        )
+        return self.annotate(
+            standardized_price=models.Case(
+                models.When(product__package_size__lte=0, then=effective_price),
+                default=effective_price / standard_size,
+                output_field=float_field,
+            )
+        )
 
 
 class ChemicalPrice(models.Model):
@@ -211,9 +256,16 @@ class ChemicalPrice(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, help_text="Who last updated this price")
     notes = models.TextField(blank=True, help_text="Additional notes about pricing or availability")
     
+    objects = ChemicalPriceQuerySet.as_manager()
+    
     class Meta:
-        unique_together = ['product', 'shop']
+        unique_together = ['product', 'shop']  # also serves (product, shop) lookups
         ordering = ['product', 'price']
+        indexes = [
+            models.Index(fields=['is_in_stock', '-last_updated']),
+            models.Index(fields=['product', 'price']),
+            models.Index(fields=['shop', 'is_in_stock']),
+        ]
     
     def __str__(self):
         return f"{self.product.name} at {self.shop.name} - {self.price} {self.currency}"
@@ -233,12 +285,16 @@ class ChemicalPrice(models.Model):
     
     def get_standardized_price(self):
         """Get price per standard unit (som per liter for liquids, som per kg for solids)"""
+        # Already computed in SQL by ChemicalPriceQuerySet.with_standardized_price()
+        if hasattr(self, 'standardized_price'):
+            return self.standardized_price
+        
         effective_price = self.get_effective_price()
         package_size = self.product.package_size
         package_unit = self.product.package_unit
         
         # Convert package size to standard unit
-        if self.product.is_liquid():
+        if self.product.is_liquid:
             # Convert to liters
             if package_unit == 'ml':
                 standard_size = package_size / 1000
@@ -265,10 +321,26 @@ class ChemicalPrice(models.Model):
     def get_standardized_price_display(self):
         """Get formatted standardized price with currency and unit"""
         price = self.get_standardized_price()
-        unit = self.product.get_standard_unit_display()
+        unit = self.product.get_standard_unit_display
         return f"{price:.2f} {unit}"
 
 
+class ProductPriceStats(models.Model):
+    """Per-product price summary, kept in sync with ChemicalPrice by signals"""
+    product = models.OneToOneField(ChemicalProduct, on_delete=models.CASCADE, primary_key=True, related_name='price_stats')
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2)
+    avg_price = models.DecimalField(max_digits=10, decimal_places=2)
+    shop_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = "Product Price Stats"
+    
+    def __str__(self):
+        return f"{self.product.name}: {self.min_price} - {self.max_price} ({self.shop_count} shops)"
+
+
 class PriceHistory(models.Model):
     """Historical price tracking for analysis"""
     chemical_price = models.ForeignKey(ChemicalPrice, on_delete=models.CASCADE, related_name='history')
@@ -281,6 +353,9 @@ class PriceHistory(models.Model):
     class Meta:
         ordering = ['-change_date']
         verbose_name_plural = "Price Histories"
+        indexes = [
+            models.Index(fields=['chemical_price', '-change_date']),
+        ]
     
     def __str__(self):
         return f"{self.chemical_price.product.name} price change: {self.old_price} → {self.new_price}"
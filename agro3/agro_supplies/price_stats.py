@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Avg, Min, Max, Count
+from .models import ChemicalPrice, ProductPriceStats
+
+
+def refresh_price_stats(product_ids=None):
+    """
+    Recompute the ProductPriceStats rows of the given products.
+
+    Args:
+        product_ids: Iterable of ChemicalProduct ids, or None for every product
+
+    Returns:
+        Number of stats rows written
+    """
+    prices = ChemicalPrice.objects.all()
+    stats = ProductPriceStats.objects.all()
+    if product_ids is not None:
+        product_ids = list(product_ids)
+        prices = prices.filter(product_id__in=product_ids)
+        stats = stats.filter(product_id__in=product_ids)
+    
+    rows = prices.values('product_id').annotate(
+        min_price=Min('price'),
+        max_price=Max('price'),
+        avg_price=Avg('price'),
+        shop_count=Count('shop', distinct=True)
+    ).order_by()
+    
+    with transaction.atomic():
+        # Upsert rather than delete-and-insert: two saves of the same product's
+        # prices can run this concurrently, and a plain insert would hit the PK
+        written = ProductPriceStats.objects.bulk_create(
+            [
+                ProductPriceStats(
+                    product_id=row['product_id'],
+                    min_price=row['min_price'],
+                    max_price=row['max_price'],
+                    avg_price=row['avg_price'].quantize(Decimal('0.01')),
+                    shop_count=row['shop_count'],
+                )
+                for row in rows
+            ],
+            update_conflicts=True,
+            unique_fields=['product'],
+            update_fields=['min_price', 'max_price', 'avg_price', 'shop_count', 'updated_at'],
+        )
+        # Products that lost their last price drop their row
+        stats.exclude(product_id__in=ChemicalPrice.objects.values('product_id')).delete()
+    return len(written)
@@ -0,0 +1,37 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .caching import bump_catalog_version
+from .price_stats import refresh_price_stats
+from .models import ChemicalCategory, ChemicalProduct, Shop, ChemicalPrice
+
+
+@receiver(post_save, sender=ChemicalCategory)
+@receiver(post_delete, sender=ChemicalCategory)
+@receiver(post_save, sender=ChemicalProduct)
+@receiver(post_delete, sender=ChemicalProduct)
+@receiver(post_save, sender=Shop)
+@receiver(post_delete, sender=Shop)
+@receiver(post_save, sender=ChemicalPrice)
+@receiver(post_delete, sender=ChemicalPrice)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Drop cached catalog pages whenever catalog data changes"""
+    bump_catalog_version()
+
+
+@receiver(pre_save, sender=ChemicalPrice)
+def remember_previous_product(sender, instance, raw=False, **kwargs):
+    """Note the stored product of an existing price, in case the save moves it"""
+    if raw or instance.pk is None:
+        return
+    instance._previous_product_id = (
+        ChemicalPrice.objects.filter(pk=instance.pk).values_list('product_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=ChemicalPrice)
+@receiver(post_delete, sender=ChemicalPrice)
+def update_product_price_stats(sender, instance, **kwargs):
+    """Keep the ProductPriceStats rows of the price's old and new product in sync"""
+    product_ids = {instance.product_id, getattr(instance, '_previous_product_id', None)}
+    product_ids.discard(None)
+    refresh_price_stats(product_ids)
@@ -1,3 +1,145 @@
-from django.test import TestCase
+import re
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from locations.models import Country, Region
+from .models import ChemicalCategory, ChemicalProduct, Shop, ChemicalPrice, ProductPriceStats
+from .price_stats import refresh_price_stats
+
+
+class PriceComparisonTests(TestCase):
+    """Tests for the price comparison page."""
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse('agro_supplies:price_comparison')
+        country = Country.objects.create(name='Kyrgyzstan', code='KG')
+        category = ChemicalCategory.objects.create(name='NPK Fertilizers', category_type='fertilizer')
+        self.product = ChemicalProduct.objects.create(
+            name='NPK 16-16-16', brand='AgriCorp', category=category,
+            active_ingredient='NPK', concentration='16-16-16', description='Balanced fertilizer',
+            usage_instructions='Apply to soil', dosage='200 kg/ha', application_method='soil',
+            package_size=Decimal('25'), package_unit='kg', target_crops='Wheat',
+        )
+        self.unpriced = ChemicalProduct.objects.create(
+            name='Organic Compost', brand='EcoFarm', category=category,
+            active_ingredient='Organic matter', concentration='Organic', description='Compost',
+            usage_instructions='Apply to soil', dosage='2 t/ha', application_method='soil',
+            package_size=Decimal('20'), package_unit='kg', target_crops='All crops',
+        )
+        for name, price in [('Agro Center', '100.00'), ('Farm Supply', '200.00')]:
+            shop = Shop.objects.create(name=name, phone_number='+996555000000', country=country, address='Bishkek')
+            ChemicalPrice.objects.create(product=self.product, shop=shop, price=Decimal(price))
+
+    def test_price_stats_per_product(self):
+        """Test that each priced product gets its min/avg/max and shop count."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        product_prices = response.context['product_prices']
+        self.assertEqual([item['product'] for item in product_prices], [self.product])
+        stats = product_prices[0]['stats']
+        self.assertEqual(stats.min_price, Decimal('100.00'))
+        self.assertEqual(stats.max_price, Decimal('200.00'))
+        self.assertEqual(stats.avg_price, Decimal('150.00'))
+        self.assertEqual(stats.shop_count, 2)
+
+    def test_price_stats_follow_price_changes(self):
+        """Test that saving and deleting prices refreshes the stored stats."""
+        cheapest = self.product.prices.get(price=Decimal('100.00'))
+        cheapest.price = Decimal('50.00')
+        cheapest.save()
+        stats = ProductPriceStats.objects.get(product=self.product)
+        self.assertEqual(stats.min_price, Decimal('50.00'))
+        self.assertEqual(stats.avg_price, Decimal('125.00'))
+
+        self.product.prices.all().delete()
+        self.assertFalse(ProductPriceStats.objects.filter(product=self.product).exists())
+
+    def test_price_moved_to_another_product_refreshes_both(self):
+        """Test that moving a price to another product refreshes both products' stats."""
+        price = self.product.prices.get(price=Decimal('100.00'))
+        price.product = self.unpriced
+        price.save()
+        stats = ProductPriceStats.objects.get(product=self.product)
+        self.assertEqual((stats.min_price, stats.shop_count), (Decimal('200.00'), 1))
+        stats = ProductPriceStats.objects.get(product=self.unpriced)
+        self.assertEqual((stats.min_price, stats.shop_count), (Decimal('100.00'), 1))
+
+    def test_refresh_updates_existing_stats_in_place(self):
+        """Test that refreshing over an existing stats row updates it instead of re-inserting."""
+        ProductPriceStats.objects.filter(product=self.product).update(min_price=Decimal('1.00'), shop_count=9)
+        self.assertEqual(refresh_price_stats([self.product.pk, self.unpriced.pk]), 1)
+        stats = ProductPriceStats.objects.get(product=self.product)
+        self.assertEqual((stats.min_price, stats.shop_count), (Decimal('100.00'), 2))
+        self.assertFalse(ProductPriceStats.objects.filter(product=self.unpriced).exists())
+
+    def test_unsaved_shop_without_location_has_a_name(self):
+        """Test that a shop with no country yet, as on an invalid admin form, still prints."""
+        self.assertEqual(str(Shop(name='New Shop')), 'New Shop (Unknown Location)')
+
+    def test_location_filter_excludes_other_countries(self):
+        """Test that filtering by a country without shops lists no products."""
+        other = Country.objects.create(name='Russia', code='RU')
+        response = self.client.get(self.url, {'country': other.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['product_prices'], [])
+
+
+class ProductLocationApiTests(TestCase):
+    """Tests for the product region/city JSON endpoints."""
+
+    def setUp(self):
+        country = Country.objects.create(name='Kyrgyzstan', code='KG')
+        self.region = Region.objects.create(name='Chuy', country=country)
+        category = ChemicalCategory.objects.create(name='Herbicides', category_type='herbicide')
+        self.product = ChemicalProduct.objects.create(
+            name='Glyphosate 360', brand='AgriCorp', category=category,
+            active_ingredient='Glyphosate', concentration='360 g/l', description='Herbicide',
+            usage_instructions='Spray', dosage='3 l/ha', application_method='spray',
+            package_size=Decimal('5'), package_unit='liter', target_crops='Wheat',
+        )
+        shop = Shop.objects.create(
+            name='Agro Center', phone_number='+996555000000', country=country, region=self.region, address='Bishkek'
+        )
+        ChemicalPrice.objects.create(product=self.product, shop=shop, price=Decimal('900.00'))
+        self.country = country
+
+    def test_regions_for_country(self):
+        """Test that regions with shops selling the product are listed."""
+        url = reverse('agro_supplies:get_product_regions', args=[self.product.pk])
+        response = self.client.get(url, {'country': self.country.pk})
+        self.assertEqual(response.json(), {'regions': [{'id': self.region.pk, 'name': 'Chuy'}]})
+
+    def test_non_numeric_ids_return_empty_lists(self):
+        """Test that malformed country/region ids give an empty list, not a server error."""
+        response = self.client.get(
+            reverse('agro_supplies:get_product_regions', args=[self.product.pk]), {'country': 'abc'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'regions': []})
+        response = self.client.get(
+            reverse('agro_supplies:get_product_cities', args=[self.product.pk]), {'region': '1 OR 1=1'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'cities': []})
+
+
+class CatalogPageCacheTests(TestCase):
+    """Tests for caching the catalog pages per visitor."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.url = reverse('agro_supplies:product_list')
+
+    def test_new_visitors_get_their_own_csrf_token(self):
+        """Test that a cookie-less visitor isn't served another visitor's CSRF token."""
+        Client().get(self.url)
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(self.url)
+        token = re.search(rb'name="csrfmiddlewaretoken" value="([^"]+)"', response.content).group(1).decode()
+        response = client.post('/i18n/setlang/', {'language': 'ru', 'next': self.url, 'csrfmiddlewaretoken': token})
+        self.assertEqual(response.status_code, 302)
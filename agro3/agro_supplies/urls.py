@@ -1,10 +1,11 @@
 from django.urls import path
+from django.views.generic import RedirectView
 from . import views
 
 app_name = 'agro_supplies'
 
 urlpatterns = [
-    path('', views.product_list, name='product_list'),
+    path('', RedirectView.as_view(pattern_name='agro_supplies:product_list', query_string=True)),
     path('products/', views.product_list, name='product_list'),
     path('products/<int:pk>/', views.product_detail, name='product_detail'),
     path('shops/', views.shop_list, name='shop_list'),
@@ -12,4 +13,6 @@ urlpatterns = [
     path('price-comparison/', views.price_comparison, name='price_comparison'),
     path('calculator/', views.price_calculator, name='calculator'),
     path('api/product-prices/<int:product_id>/', views.get_product_prices, name='get_product_prices'),
+    path('api/product-regions/<int:product_id>/', views.get_product_regions, name='get_product_regions'),
+    path('api/product-cities/<int:product_id>/', views.get_product_cities, name='get_product_cities'),
 ]
\ No newline at end of file
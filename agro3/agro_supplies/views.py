@@ -1,18 +1,22 @@
 from django.shortcuts import render, get_object_or_404
-from django.db.models import Q, Avg, Min, Max, Count
+from django.db.models import F, Q, Avg, Min, Max, Count, Prefetch, Exists, OuterRef
 from django.db import models
 from django.core.paginator import Paginator
+from .caching import cache_catalog_page, cache_catalog_api
 from .models import ChemicalCategory, ChemicalProduct, Shop, ChemicalPrice
 from locations.models import Country, Region, City
 
 
+@cache_catalog_page
 def product_list(request):
     """List all chemical products with filtering and search - focused on pricing"""
-    products = ChemicalProduct.objects.filter(is_active=True).select_related('category').prefetch_related('prices__shop')
+    products = ChemicalProduct.objects.filter(is_active=True).select_related('category')
     categories = ChemicalCategory.objects.all()
     
     # Get location options for filtering - based on shops that sell products
-    countries = Country.objects.filter(shops__product_prices__product__is_active=True).distinct().order_by('name')
+    countries = Country.objects.filter(
+        Exists(Shop.objects.filter(country=OuterRef('pk'), product_prices__product__is_active=True))
+    ).order_by('name')
     regions = Region.objects.none()  # Will be populated based on country selection
     
     # Filtering
@@ -26,13 +30,21 @@ def product_list(request):
     
     if country_id:
         # Filter products available in the selected country
-        products = products.filter(prices__shop__country_id=country_id).distinct()
+        # (EXISTS subqueries avoid joining prices into the row set and the DISTINCT that needs)
+        products = products.filter(
+            Exists(ChemicalPrice.objects.filter(product=OuterRef('pk'), shop__country_id=country_id))
+        )
         # Get regions for selected country
-        regions = Region.objects.filter(country_id=country_id, shops__product_prices__product__is_active=True).distinct().order_by('name')
+        regions = Region.objects.filter(
+            Exists(Shop.objects.filter(region=OuterRef('pk'), product_prices__product__is_active=True)),
+            country_id=country_id
+        ).order_by('name')
         
         if region_id:
             # Further filter by region
-            products = products.filter(prices__shop__region_id=region_id).distinct()
+            products = products.filter(
+                Exists(ChemicalPrice.objects.filter(product=OuterRef('pk'), shop__region_id=region_id))
+            )
     
     # Search
     search_query = request.GET.get('search')
@@ -45,13 +57,24 @@ def product_list(request):
         )
     
     # Order products with prices - prioritize products with available prices
-    products = products.annotate(
-        min_price=Min('prices__price'),
-        price_count=models.Count('prices')
-    ).order_by('-price_count', 'min_price', 'brand', 'name')
+    products = products.order_by(
+        F('price_stats__shop_count').desc(nulls_last=True), 'price_stats__min_price', 'brand', 'name'
+    )
     
-    # Prefetch prices with shop information for efficient querying
-    products = products.prefetch_related('prices__shop__country', 'prices__shop__region', 'prices__shop__city')
+    # Skip the long text columns the table never shows
+    products = products.only(
+        'name', 'brand', 'concentration', 'package_size', 'package_unit',
+        'category__name', 'category__category_type'
+    )
+    
+    # Prefetch prices with only the shop columns the table shows
+    products = products.prefetch_related(
+        Prefetch('prices', queryset=ChemicalPrice.objects.with_standardized_price().select_related(
+            'shop__country', 'shop__region', 'shop__city'
+        ).only(
+            'product', 'shop__name', 'shop__country', 'shop__region', 'shop__city'
+        ))
+    )
     
     # Pagination
     paginator = Paginator(products, 15)  # Show 15 products per page for table display
@@ -67,24 +90,36 @@ def product_list(request):
         'selected_country': country_id,
         'selected_region': region_id,
         'search_query': search_query,
-        'total_products': products.count()
+        'total_products': paginator.count
     }
     return render(request, 'agro_supplies/product_list.html', context)
 
 
+def product_regions(product, country_id):
+    """Regions of a country that have shops selling the product"""
+    return Region.objects.filter(
+        Exists(ChemicalPrice.objects.filter(product=product, shop__region=OuterRef('pk'))),
+        country_id=country_id,
+    )
+
+
+def product_cities(product, region_id):
+    """Cities of a region that have shops selling the product"""
+    return City.objects.filter(
+        Exists(ChemicalPrice.objects.filter(product=product, shop__city=OuterRef('pk'))),
+        region_id=region_id,
+    )
+
+
 def product_detail(request, pk):
     """Detailed view of a chemical product with price comparison"""
-    product = get_object_or_404(ChemicalProduct, pk=pk, is_active=True)
+    product = get_object_or_404(ChemicalProduct.objects.select_related('price_stats'), pk=pk, is_active=True)
     
     # Get all prices for this product
     prices = ChemicalPrice.objects.filter(product=product).select_related('shop', 'shop__country', 'shop__region', 'shop__city').order_by('price')
     
-    # Price statistics
-    price_stats = prices.aggregate(
-        min_price=Min('price'),
-        max_price=Max('price'),
-        avg_price=Avg('price')
-    )
+    # Price statistics (None until the product has a price)
+    price_stats = getattr(product, 'price_stats', None)
     
     # Filter by location if specified
     country_id = request.GET.get('country')
@@ -98,10 +133,13 @@ def product_detail(request, pk):
     if city_id:
         prices = prices.filter(shop__city_id=city_id)
     
-    # Location options for filtering
-    countries = Country.objects.filter(shops__product_prices__product=product).distinct()
-    regions = Region.objects.filter(shops__product_prices__product=product).distinct()
-    cities = City.objects.filter(shops__product_prices__product=product).distinct()
+    # Location options for filtering; regions and cities are only needed to
+    # redisplay an active filter, the selects are filled via AJAX otherwise
+    countries = Country.objects.filter(
+        Exists(ChemicalPrice.objects.filter(product=product, shop__country=OuterRef('pk')))
+    )
+    regions = product_regions(product, country_id) if country_id else Region.objects.none()
+    cities = product_cities(product, region_id) if region_id else City.objects.none()
     
     context = {
         'product': product,
@@ -117,6 +155,7 @@ def product_detail(request, pk):
     return render(request, 'agro_supplies/product_detail.html', context)
 
 
+@cache_catalog_page
 def shop_list(request):
     """List all shops with filtering"""
     shops = Shop.objects.filter(is_active=True).select_related('country', 'region', 'city')
@@ -147,23 +186,31 @@ def shop_list(request):
             Q(address__icontains=search_query)
         )
     
+    # Only the columns the shop cards show
+    shops = shops.only(
+        'name', 'shop_type', 'owner_name', 'phone_number', 'whatsapp_number', 'website',
+        'is_verified', 'delivery_available', 'delivery_radius_km', 'working_hours',
+        'country', 'region', 'city'
+    )
+    
     # Pagination
     paginator = Paginator(shops, 10)  # Show 10 shops per page
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Filter options
-    countries = Country.objects.filter(shops__is_active=True).distinct()
+    # Filter options (IN subqueries instead of joining shops and de-duplicating)
+    active_shops = Shop.objects.filter(is_active=True)
+    countries = Country.objects.filter(pk__in=active_shops.values('country_id'))
     
     # Only load regions/cities if country/region is selected (for form resubmission)
     regions = []
     cities = []
     
     if country_id:
-        regions = Region.objects.filter(country_id=country_id, shops__is_active=True).distinct()
+        regions = Region.objects.filter(country_id=country_id, pk__in=active_shops.values('region_id'))
         
         if region_id:
-            cities = City.objects.filter(region_id=region_id, shops__is_active=True).distinct()
+            cities = City.objects.filter(region_id=region_id, pk__in=active_shops.values('city_id'))
     
     context = {
         'page_obj': page_obj,
@@ -176,17 +223,21 @@ def shop_list(request):
         'selected_region': region_id,
         'selected_city': city_id,
         'search_query': search_query,
-        'total_shops': shops.count()
+        'total_shops': paginator.count
     }
     return render(request, 'agro_supplies/shop_list.html', context)
 
 
 def shop_detail(request, pk):
     """Detailed view of a shop with all products and prices"""
-    shop = get_object_or_404(Shop, pk=pk, is_active=True)
+    shop = get_object_or_404(Shop.objects.select_related('country', 'region', 'city'), pk=pk, is_active=True)
     
     # Get all products sold by this shop with their prices
-    prices = ChemicalPrice.objects.filter(shop=shop).select_related('product', 'product__category').order_by('product__category', 'product__name')
+    prices = ChemicalPrice.objects.filter(shop=shop).select_related('product', 'product__category').only(
+        'price', 'currency', 'discount_percentage', 'bulk_price', 'bulk_price_threshold',
+        'is_in_stock', 'stock_quantity', 'last_updated',
+        'product__name', 'product__brand', 'product__category__category_type'
+    ).order_by('product__category', 'product__name')
     
     # Filter by category if specified
     category_id = request.GET.get('category')
@@ -203,7 +254,9 @@ def shop_detail(request, pk):
         )
     
     # Categories available in this shop
-    categories = ChemicalCategory.objects.filter(products__prices__shop=shop).distinct()
+    categories = ChemicalCategory.objects.filter(
+        pk__in=ChemicalProduct.objects.filter(prices__shop=shop).values('category_id')
+    )
     
     # Pagination
     paginator = Paginator(prices, 15)  # Show 15 products per page
@@ -216,11 +269,12 @@ def shop_detail(request, pk):
         'categories': categories,
         'selected_category': category_id,
         'search_query': search_query,
-        'total_products': prices.count()
+        'total_products': paginator.count
     }
     return render(request, 'agro_supplies/shop_detail.html', context)
 
 
+@cache_catalog_page
 def price_comparison(request):
     """Compare prices across different shops for products"""
     products = ChemicalProduct.objects.filter(is_active=True).select_related('category')
@@ -245,9 +299,9 @@ def price_comparison(request):
     city_id = request.GET.get('city')
     
     # Get products with their price ranges
-    product_prices = []
-    for product in products[:20]:  # Limit to 20 products for performance
-        prices_query = ChemicalPrice.objects.filter(product=product)
+    if country_id or region_id or city_id:
+        products = list(products[:20])  # Limit to 20 products for performance
+        prices_query = ChemicalPrice.objects.filter(product__in=products)
         
         if country_id:
             prices_query = prices_query.filter(shop__country_id=country_id)
@@ -256,24 +310,37 @@ def price_comparison(request):
         if city_id:
             prices_query = prices_query.filter(shop__city_id=city_id)
         
-        price_stats = prices_query.aggregate(
-            min_price=Min('price'),
-            max_price=Max('price'),
-            avg_price=Avg('price'),
-            shop_count=prices_query.count()
-        )
-        
-        if price_stats['min_price']:  # Only include products with prices
-            product_prices.append({
-                'product': product,
-                'stats': price_stats
-            })
+        # One GROUP BY over all listed products instead of an aggregate per product
+        stats_by_product = {
+            row['product_id']: row
+            for row in prices_query.values('product_id').annotate(
+                min_price=Min('price'),
+                max_price=Max('price'),
+                avg_price=Avg('price'),
+                shop_count=Count('shop', distinct=True)
+            ).order_by()
+        }
+    else:
+        # Unfiltered stats are kept precomputed in ProductPriceStats
+        products = list(products.select_related('price_stats')[:20])
+        stats_by_product = {
+            product.pk: product.price_stats
+            for product in products
+            if hasattr(product, 'price_stats')
+        }
+    
+    product_prices = [
+        {'product': product, 'stats': stats_by_product[product.pk]}
+        for product in products
+        if product.pk in stats_by_product  # Only include products with prices
+    ]
     
     # Filter options
     categories = ChemicalCategory.objects.all()
-    countries = Country.objects.filter(shops__product_prices__isnull=False).distinct()
-    regions = Region.objects.filter(shops__product_prices__isnull=False).distinct()
-    cities = City.objects.filter(shops__product_prices__isnull=False).distinct()
+    priced_shops = Shop.objects.filter(product_prices__isnull=False)
+    countries = Country.objects.filter(pk__in=priced_shops.values('country_id'))
+    regions = Region.objects.filter(pk__in=priced_shops.values('region_id'))
+    cities = City.objects.filter(pk__in=priced_shops.values('city_id'))
     
     context = {
         'product_prices': product_prices,
@@ -290,11 +357,21 @@ def price_comparison(request):
     return render(request, 'agro_supplies/price_comparison.html', context)
 
 
+@cache_catalog_page
 def price_calculator(request):
     """Chemical product price calculator"""
-    products = ChemicalProduct.objects.filter(is_active=True, prices__isnull=False).distinct().select_related('category').order_by('brand', 'name')
+    # Every priced product fills the dropdown, so keep the rows narrow
+    products = ChemicalProduct.objects.filter(
+        Exists(ChemicalPrice.objects.filter(product=OuterRef('pk'))),
+        is_active=True,
+    ).select_related('category').only(
+        'name', 'brand', 'concentration', 'package_size', 'package_unit',
+        'category__name', 'category__category_type'
+    ).order_by('brand', 'name')
     categories = ChemicalCategory.objects.all()
-    countries = Country.objects.filter(shops__product_prices__product__is_active=True).distinct().order_by('name')
+    countries = Country.objects.filter(
+        Exists(Shop.objects.filter(country=OuterRef('pk'), product_prices__product__is_active=True))
+    ).order_by('name')
     
     context = {
         'products': products,
@@ -304,6 +381,7 @@ def price_calculator(request):
     return render(request, 'agro_supplies/calculator.html', context)
 
 
+@cache_catalog_api
 def get_product_prices(request, product_id):
     """API endpoint to get prices for a specific product"""
     from django.http import JsonResponse
@@ -313,25 +391,32 @@ def get_product_prices(request, product_id):
         prices = ChemicalPrice.objects.filter(
             product=product, 
             is_in_stock=True
-        ).select_related('shop', 'shop__country', 'shop__region', 'shop__city').order_by('price')
+        ).order_by('price').values(
+            'id', 'shop__name', 'shop__city__name', 'shop__region__name', 'shop__country__name',
+            'price', 'currency'
+        )
         
+        package_size = float(product.package_size)
+        package_unit = product.get_package_unit_display()
         price_data = []
         for price in prices:
+            # Same format as Shop.get_location_display()
+            location_parts = (price['shop__city__name'], price['shop__region__name'], price['shop__country__name'])
             price_data.append({
-                'id': price.id,
-                'shop_name': price.shop.name,
-                'shop_location': price.shop.get_location_display(),
-                'price': float(price.price),  # This is the price per package at this shop
-                'currency': price.currency,
-                'package_size': float(product.package_size),
-                'package_unit': product.get_package_unit_display(),
+                'id': price['id'],
+                'shop_name': price['shop__name'],
+                'shop_location': ", ".join(part for part in location_parts if part),
+                'price': float(price['price']),  # This is the price per package at this shop
+                'currency': price['currency'],
+                'package_size': package_size,
+                'package_unit': package_unit,
             })
         
         return JsonResponse({
             'success': True,
             'product_name': f"{product.brand} {product.name}",
-            'package_size': float(product.package_size),
-            'package_unit': product.get_package_unit_display(),
+            'package_size': package_size,
+            'package_unit': package_unit,
             'prices': price_data
         })
     
@@ -340,3 +425,28 @@ def get_product_prices(request, product_id):
             'success': False,
             'error': 'Product not found'
         })
+
+
+@cache_catalog_api
+def get_product_regions(request, product_id):
+    """API endpoint to get the regions of a country where a product is sold"""
+    from django.http import JsonResponse
+
+    country_id = request.GET.get('country', '')
+    regions = []
+    # Anything but a numeric id (e.g. ?country=abc) matches nothing rather than erroring
+    if country_id.isdigit():
+        regions = list(product_regions(product_id, country_id).order_by('name').values('id', 'name'))
+    return JsonResponse({'regions': regions})
+
+
+@cache_catalog_api
+def get_product_cities(request, product_id):
+    """API endpoint to get the cities of a region where a product is sold"""
+    from django.http import JsonResponse
+
+    region_id = request.GET.get('region', '')
+    cities = []
+    if region_id.isdigit():
+        cities = list(product_cities(product_id, region_id).order_by('name').values('id', 'name'))
+    return JsonResponse({'cities': cities})
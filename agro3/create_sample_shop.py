@@ -7,9 +7,72 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'agro_main.settings')
 django.setup()
 
-from agro_supplies.models import Shop
+from decimal import Decimal
+
+from django.db import transaction
+
+from agro_supplies.caching import bump_catalog_version
+from agro_supplies.models import ChemicalProduct, ChemicalPrice, Shop
+from agro_supplies.price_stats import refresh_price_stats
 from locations.models import Country, Region, City
 
+# Rows per INSERT statement when seeding
+BULK_BATCH_SIZE = int(os.environ.get('AGRO_BULK_BATCH', 500))
+
+
+def seed_shops(rows):
+    """
+    Create the shops in rows (dicts of Shop field values) that don't exist yet.
+
+    Existing shops are matched by name with a single query and the missing
+    ones are inserted with bulk_create instead of a get_or_create per row.
+
+    Returns:
+        Tuple of (list of shops in row order, set of names that were created)
+    """
+    names = [row['name'] for row in rows]
+    existing = set(Shop.objects.filter(name__in=names).values_list('name', flat=True))
+    Shop.objects.bulk_create(
+        [Shop(**row) for row in rows if row['name'] not in existing],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    shops = Shop.objects.select_related('country', 'region', 'city').filter(name__in=names)
+    shops_by_name = {shop.name: shop for shop in shops}
+    return [shops_by_name[name] for name in names], set(names) - existing
+
+
+def seed_prices(shop, products, prices):
+    """
+    Add a price at shop for each product, skipping products it already prices.
+
+    ChemicalPrice is the through model of Shop.chemical_products, so rows
+    are built directly and inserted with bulk_create. Bulk inserts send no
+    signals, so price stats and the catalog cache are refreshed here.
+
+    Returns:
+        Number of price rows inserted
+    """
+    products = list(products)
+    shop_prices = shop.product_prices.filter(product__in=products)
+    existing = set(shop_prices.values_list('product_id', flat=True))
+    ChemicalPrice.objects.bulk_create(
+        [
+            ChemicalPrice(shop=shop, product=product, price=price)
+            for product, price in zip(products, prices)
+            if product.pk not in existing
+        ],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    # ignore_conflicts hides rows skipped as duplicates, so count what was stored
+    added = shop_prices.count() - len(existing)
+    refresh_price_stats(product.pk for product in products)
+    bump_catalog_version()
+    return added
+
+
+@transaction.atomic
 def create_sample_shop():
     # Get or create location data
     country, _ = Country.objects.get_or_create(
@@ -19,43 +82,39 @@ def create_sample_shop():
     
     region, _ = Region.objects.get_or_create(
         name='Batken Region',
-        country=country,
-        defaults={'code': 'BT'}
+        country=country
     )
     
     city, _ = City.objects.get_or_create(
         name='Batken',
-        region=region,
-        defaults={'country': country}
+        region=region
     )
     
     # Create or update sample shop with new contact fields
-    shop, created = Shop.objects.get_or_create(
-        name='AgroMart Batken',
-        defaults={
-            'shop_type': 'retail',
-            'owner_name': 'Amantur Isaev',
-            'phone_number': '+996555123456',
-            'whatsapp_number': '+996777123456',
-            'email': 'info@agromart-batken.kg',
-            'website': 'https://agromart-batken.kg',
-            'google_maps_link': 'https://maps.google.com/?q=40.0628,70.8172',
-            'country': country,
-            'region': region,
-            'city': city,
-            'address': 'Lenin Street 45, Near Central Bazaar, Batken 722800',
-            'license_number': 'LIC-2023-BT-001',
-            'established_year': 2018,
-            'description': 'Leading agricultural supplies store in Batken region. We specialize in fertilizers, pesticides, and farming equipment. Serving farmers for over 5 years with quality products and expert advice.',
-            'working_hours': 'Mon-Sat: 8:00 AM - 6:00 PM, Sun: 9:00 AM - 4:00 PM',
-            'delivery_available': True,
-            'delivery_radius_km': 50,
-            'is_active': True,
-            'is_verified': True,
-        }
-    )
+    [shop], created_names = seed_shops([{
+        'name': 'AgroMart Batken',
+        'shop_type': 'retail',
+        'owner_name': 'Amantur Isaev',
+        'phone_number': '+996555123456',
+        'whatsapp_number': '+996777123456',
+        'email': 'info@agromart-batken.kg',
+        'website': 'https://agromart-batken.kg',
+        'google_maps_link': 'https://maps.google.com/?q=40.0628,70.8172',
+        'country': country,
+        'region': region,
+        'city': city,
+        'address': 'Lenin Street 45, Near Central Bazaar, Batken 722800',
+        'license_number': 'LIC-2023-BT-001',
+        'established_year': 2018,
+        'description': 'Leading agricultural supplies store in Batken region. We specialize in fertilizers, pesticides, and farming equipment. Serving farmers for over 5 years with quality products and expert advice.',
+        'working_hours': 'Mon-Sat: 8:00 AM - 6:00 PM, Sun: 9:00 AM - 4:00 PM',
+        'delivery_available': True,
+        'delivery_radius_km': 50,
+        'is_active': True,
+        'is_verified': True,
+    }])
     
-    if created:
+    if shop.name in created_names:
         print(f"✅ Created sample shop: {shop.name}")
     else:
         print(f"✅ Shop already exists: {shop.name}")
@@ -67,7 +126,13 @@ def create_sample_shop():
         shop.save()
         print(f"✅ Updated shop with new contact fields")
     
-    print(f"📍 Shop Location: {shop.get_location_display()}")
+    # Stock the shop with a few catalog products, if any exist yet
+    products = ChemicalProduct.objects.filter(is_active=True).order_by('brand', 'name')[:5]
+    sample_prices = [Decimal('950.00'), Decimal('1250.00'), Decimal('1800.00'), Decimal('2200.00'), Decimal('1450.00')]
+    added = seed_prices(shop, products, sample_prices)
+    print(f"💰 Added {added} product prices")
+    
+    print(f"📍 Shop Location: {shop.get_location_display}")
     print(f"📞 Phone: {shop.phone_number}")
     print(f"💬 WhatsApp: {shop.whatsapp_number}")
     print(f"🗺️  Maps: {shop.google_maps_link}")
@@ -0,0 +1,31 @@
+"""
+Page caching for the crop reference pages.
+
+Saving or deleting a crop bumps the crops version (see signals.py), which
+retires every cached crop page and crop count at once.
+"""
+from agro_main.caching import bump_cache_version, cache_per_cookie, get_cache_version, versioned_cache_page
+
+CROPS_CACHE_TIMEOUT = 60 * 15
+CROPS_VERSION_KEY = 'crops:version'
+
+_versioned_crops_cache = versioned_cache_page(CROPS_CACHE_TIMEOUT, CROPS_VERSION_KEY, 'crops')
+
+
+def get_crops_version():
+    """Return the current crops version"""
+    return get_cache_version(CROPS_VERSION_KEY)
+
+
+def bump_crops_version():
+    """Invalidate every cached crop page"""
+    bump_cache_version(CROPS_VERSION_KEY)
+
+
+def cache_crops_page(view_func):
+    """
+    Cache a crop view's response until it times out or any crop changes.
+
+    Pages are cached per visitor's cookies (see cache_per_cookie).
+    """
+    return cache_per_cookie(_versioned_crops_cache)(view_func)
@@ -0,0 +1,31 @@
+# Adds pg_trgm indexes for the icontains search columns (PostgreSQL only)
+
+from django.db import migrations
+
+from agro_main import trigram
+
+
+# Columns searched with icontains from the crops admin
+SEARCH_COLUMNS = [
+    ('crops_crop', 'name'),
+    ('crops_crop', 'description'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    trigram.create_trigram_indexes(schema_editor, SEARCH_COLUMNS)
+
+
+def drop_indexes(apps, schema_editor):
+    trigram.drop_trigram_indexes(schema_editor, SEARCH_COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0002_remove_soil_references'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
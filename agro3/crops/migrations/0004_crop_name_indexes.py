@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0003_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='crop',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='crop',
+            name='scientific_name',
+            field=models.CharField(blank=True, db_index=True, max_length=150, null=True),
+        ),
+    ]
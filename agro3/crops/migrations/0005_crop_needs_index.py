@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0004_crop_name_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['sunlight_needs', 'water_needs', 'name'], name='crops_crop_sunligh_9e8d30_idx'),
+        ),
+    ]
@@ -28,8 +28,8 @@ class Crop(models.Model):
         ('High', 'High'),
     ]
     
-    name = models.CharField(max_length=100)
-    scientific_name = models.CharField(max_length=150, blank=True, null=True)
+    name = models.CharField(max_length=100, db_index=True)
+    scientific_name = models.CharField(max_length=150, blank=True, null=True, db_index=True)
     description = models.TextField()
     sunlight_needs = models.CharField(max_length=20, choices=SUNLIGHT_CHOICES)
     water_needs = models.CharField(max_length=20, choices=WATER_CHOICES)
@@ -45,6 +45,10 @@ class Crop(models.Model):
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Related crops on the detail page match on both needs, ordered by name
+            models.Index(fields=['sunlight_needs', 'water_needs', 'name']),
+        ]
     
     def __str__(self):
         return self.name
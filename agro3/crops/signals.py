@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .caching import bump_crops_version
+from .models import Crop
+
+
+@receiver(post_save, sender=Crop)
+@receiver(post_delete, sender=Crop)
+def invalidate_crops_cache(sender, **kwargs):
+    """Drop cached crop pages whenever a crop changes"""
+    bump_crops_version()
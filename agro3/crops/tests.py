@@ -1,3 +1,30 @@
-from django.test import TestCase
+import re
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+
+class CropPageCacheTests(TestCase):
+    """Tests for caching the crop pages per visitor."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.url = reverse('crops:list')
+
+    def test_new_visitors_get_their_own_csrf_token(self):
+        """Test that a cookie-less visitor isn't served another visitor's CSRF token."""
+        Client().get(self.url)
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(self.url)
+        token = re.search(rb'name="csrfmiddlewaretoken" value="([^"]+)"', response.content).group(1).decode()
+        response = client.post('/i18n/setlang/', {'language': 'ru', 'next': self.url, 'csrfmiddlewaretoken': token})
+        self.assertEqual(response.status_code, 302)
+
+    def test_returning_visitor_is_served_from_cache(self):
+        """Test that a visitor with a CSRF cookie gets the cached page."""
+        self.client.get(self.url)
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
@@ -5,11 +5,43 @@ This module handles HTTP requests for viewing crop information, filtering crops
 by various criteria, and displaying detailed crop characteristics to help farmers
 make informed planting decisions.
 """
+import hashlib
+
 from django.shortcuts import render, get_object_or_404
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from .caching import cache_crops_page, get_crops_version
 from .models import Crop
 
+# Filter choices for the crop list template
+SUNLIGHT_CHOICES = tuple(Crop.SUNLIGHT_CHOICES)
+WATER_CHOICES = tuple(Crop.WATER_CHOICES)
+
 
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that caches the total row count of its queryset.
+
+    Paging through the same filtered list reuses the count for
+    COUNT_CACHE_TIMEOUT seconds instead of running SELECT COUNT(*) per page;
+    the key includes the crops version, so a crop change starts fresh counts.
+    """
+    COUNT_CACHE_TIMEOUT = 300
+
+    @cached_property
+    def count(self):
+        sql, params = self.object_list.query.sql_with_params()
+        digest = hashlib.md5(f'{sql}{params}'.encode(), usedforsecurity=False).hexdigest()
+        key = f'crop_count:{get_crops_version()}:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, self.COUNT_CACHE_TIMEOUT)
+        return count
+
+
+@cache_crops_page
 def crop_list_view(request):
     """
     Display a list of all crops with pagination and filtering.
@@ -22,7 +54,10 @@ def crop_list_view(request):
     Returns:
         Paginated list of crops (12 per page) with applied filters
     """
-    crops = Crop.objects.all()
+    # The cards show a short description excerpt; the other text fields stay unloaded
+    crops = Crop.objects.only(
+        'name', 'scientific_name', 'description', 'sunlight_needs', 'water_needs', 'featured_image'
+    )
     
     # Filter by sunlight needs if provided
     sunlight_filter = request.GET.get('sunlight')
@@ -40,18 +75,14 @@ def crop_list_view(request):
         crops = crops.filter(name__icontains=search)
     
     # Pagination
-    paginator = Paginator(crops, 12)  # Show 12 crops per page
+    paginator = CachedCountPaginator(crops, 12)  # Show 12 crops per page
     page_number = request.GET.get('page')
     crops = paginator.get_page(page_number)
     
-    # Get filter choices for the template
-    sunlight_choices = Crop.SUNLIGHT_CHOICES
-    water_choices = Crop.WATER_CHOICES
-    
     context = {
         'crops': crops,
-        'sunlight_choices': sunlight_choices,
-        'water_choices': water_choices,
+        'sunlight_choices': SUNLIGHT_CHOICES,
+        'water_choices': WATER_CHOICES,
         'current_sunlight': sunlight_filter,
         'current_water': water_filter,
         'current_search': search or '',
@@ -60,6 +91,7 @@ def crop_list_view(request):
     return render(request, 'crops/crop_list.html', context)
 
 
+@cache_crops_page
 def crop_detail_view(request, pk):
     """
     Display detailed information about a specific crop.
@@ -80,7 +112,7 @@ def crop_detail_view(request, pk):
     related_crops = Crop.objects.filter(
         sunlight_needs=crop.sunlight_needs,
         water_needs=crop.water_needs
-    ).exclude(pk=crop.pk)[:4]
+    ).exclude(pk=crop.pk).only('name', 'featured_image', 'sunlight_needs', 'water_needs')[:4]
     
     context = {
         'crop': crop,
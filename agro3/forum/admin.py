@@ -1,11 +1,25 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef
+from django.utils.translation import get_language
 from .models import Category, Tag, BlogPost, Comment, PostImage
+from .paginators import LargeTablePaginator
 from django import forms
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
-import logging
 
-logger = logging.getLogger(__name__)
+# BlogPost's HTML bodies; admin lists never render them, so they are deferred
+BLOG_POST_BODY_FIELDS = ['content', 'content_en', 'content_ru', 'content_ky']
+BLOG_POST_CONTENT_FIELDS = [f'blog_post__{field}' for field in BLOG_POST_BODY_FIELDS]
+
+# has_media badge per (has_image, has_video)
+MEDIA_BADGES = {
+    (True, True): mark_safe('<span style="color: green;">📷 🎥</span>'),
+    (True, False): mark_safe('<span style="color: blue;">📷</span>'),
+    (False, True): mark_safe('<span style="color: red;">🎥</span>'),
+    (False, False): mark_safe('<span style="color: gray;">-</span>'),
+}
 
 
 class SimpleRichTextWidget(forms.Textarea):
@@ -36,17 +50,13 @@ class SimpleRichTextFormField(forms.CharField):
     Simple rich text form field that just handles HTML content directly.
     No complex JSON or delta formats - just clean HTML.
     """
-    widget = SimpleRichTextWidget
-    
-    def __init__(self, *args, **kwargs):
-        kwargs.setdefault('widget', SimpleRichTextWidget())
-        super().__init__(*args, **kwargs)
+    widget = SimpleRichTextWidget  # Field.__init__ instantiates it when no widget is passed
     
     def to_python(self, value):
         """Convert to clean HTML."""
         if not value:
             return ''
-        return str(value)
+        return value if isinstance(value, str) else str(value)
 
 
 
@@ -77,25 +87,14 @@ class BlogPostAdminForm(forms.ModelForm):
     def clean(self):
         cleaned_data = super().clean()
         
-        # Check if at least one form of content is provided
-        html_files = [
-            cleaned_data.get('html_file'),
-            cleaned_data.get('html_file_en'),
-            cleaned_data.get('html_file_ru'),
-            cleaned_data.get('html_file_ky')
-        ]
-        
-        rich_text_content = [
-            cleaned_data.get('content'),
-            cleaned_data.get('content_en'),
-            cleaned_data.get('content_ru'),
-            cleaned_data.get('content_ky')
-        ]
+        # Check if at least one form of content is provided (stops at the first one found)
+        has_content = any(
+            cleaned_data.get(field) for field in ('html_file', 'html_file_en', 'html_file_ru', 'html_file_ky')
+        ) or any(
+            cleaned_data.get(field) for field in ('content', 'content_en', 'content_ru', 'content_ky')
+        )
         
-        has_html_content = any(html_files)
-        has_rich_text = any(rich_text_content)
-        
-        if not has_html_content and not has_rich_text:
+        if not has_content:
             raise forms.ValidationError(
                 "Please provide content in at least one language using either HTML files or the rich text editor."
             )
@@ -113,6 +112,11 @@ class PostImageInline(admin.TabularInline):
     fields = ['image', 'caption', 'alt_text', 'order']
     readonly_fields = ['image_preview']
     
+    def get_queryset(self, request):
+        # Each row's label (PostImage.__str__) reads the post title
+        return super().get_queryset(request).select_related('blog_post').defer('created_at', *BLOG_POST_CONTENT_FIELDS)
+    
+    @admin.display(description="Preview")
     def image_preview(self, obj):
         if obj.image:
             return format_html(
@@ -120,7 +124,43 @@ class PostImageInline(admin.TabularInline):
                 obj.image.url
             )
         return "No image"
-    image_preview.short_description = "Preview"
+
+
+class PopularTagListFilter(admin.SimpleListFilter):
+    """
+    Filter posts by one of the 20 most used tags.
+
+    The tag choices are cached for five minutes instead of running a
+    DISTINCT join over every post's tags on each changelist load.
+    """
+    title = 'tag'
+    parameter_name = 'tag'
+
+    def lookups(self, request, model_admin):
+        return cache.get_or_set(
+            f'forum_admin_popular_tags:{get_language()}',
+            lambda: list(
+                Tag.objects.annotate(post_count=Count('posts'))
+                .order_by('-post_count', 'name')
+                .values_list('slug', 'name')[:20]
+            ),
+            300,
+        )
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(tags__slug=self.value())
+        return queryset
+
+
+class BlogPostChangeList(ChangeList):
+    """Changelist that leaves the post bodies unloaded"""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).defer(
+            *BLOG_POST_BODY_FIELDS,
+            'short_description', 'short_description_en', 'short_description_ru', 'short_description_ky',
+        )
 
 
 @admin.register(Category)
@@ -173,10 +213,14 @@ class BlogPostAdmin(admin.ModelAdmin):
     form = BlogPostAdminForm
     inlines = [PostImageInline]
     list_display = ['title', 'author', 'category', 'publication_date', 'is_published', 'is_featured', 'views_count', 'has_media']
-    list_filter = ['category', 'tags', 'is_published', 'is_featured', 'publication_date', 'created_at']
-    search_fields = ['title', 'content', 'short_description']
+    list_filter = ['category', PopularTagListFilter, 'is_published', 'is_featured', 'publication_date', 'created_at']
+    list_select_related = ['author', 'category']
+    paginator = LargeTablePaginator
+    show_full_result_count = False
+    # content (the full HTML body) is left out to keep search on short, indexed columns
+    search_fields = ['title_en', 'title_ru', 'title_ky', 'short_description']
     prepopulated_fields = {'slug': ('title',)}
-    filter_horizontal = ['tags']
+    autocomplete_fields = ['category', 'tags', 'author']
     readonly_fields = ['views_count', 'created_at', 'updated_at', 'featured_image_preview']
     date_hierarchy = 'publication_date'
     
@@ -228,6 +272,17 @@ class BlogPostAdmin(admin.ModelAdmin):
     )
     ordering = ['-publication_date']
     
+    def get_queryset(self, request):
+        # Lets has_media() read a flag instead of querying images per row
+        return super().get_queryset(request).annotate(
+            _has_images=Exists(PostImage.objects.filter(blog_post=OuterRef('pk')))
+        )
+    
+    def get_changelist(self, request, **kwargs):
+        # The change form still loads whole rows through get_queryset()
+        return BlogPostChangeList
+    
+    @admin.display(description="Featured Image Preview")
     def featured_image_preview(self, obj):
         if obj.featured_image:
             return format_html(
@@ -235,31 +290,29 @@ class BlogPostAdmin(admin.ModelAdmin):
                 obj.featured_image.url
             )
         return "No featured image"
-    featured_image_preview.short_description = "Featured Image Preview"
     
+    @admin.display(description="Media")
     def has_media(self, obj):
-        has_image = bool(obj.featured_image or obj.images.exists())
-        has_video = bool(obj.featured_video or obj.youtube_url)
-        
-        if has_image and has_video:
-            return format_html('<span style="color: green;">📷 🎥</span>')
-        elif has_image:
-            return format_html('<span style="color: blue;">📷</span>')
-        elif has_video:
-            return format_html('<span style="color: red;">🎥</span>')
-        return format_html('<span style="color: gray;">-</span>')
-    has_media.short_description = "Media"
+        has_image = bool(obj.featured_image or obj._has_images)
+        return MEDIA_BADGES[has_image, obj.has_video]
 
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ['blog_post', 'author', 'publication_date', 'is_agronomist_reply', 'is_approved']
     list_filter = ['is_agronomist_reply', 'is_approved', 'publication_date', 'created_at']
+    list_select_related = ['blog_post', 'author']
+    autocomplete_fields = ['blog_post', 'author']
+    paginator = LargeTablePaginator
+    show_full_result_count = False
     search_fields = ['content', 'author__username', 'blog_post__title']
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'publication_date'
     ordering = ['-publication_date']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer(*BLOG_POST_CONTENT_FIELDS)
+    
     fieldsets = (
         ('Comment Details', {
             'fields': ('blog_post', 'author', 'content')
@@ -278,10 +331,17 @@ class CommentAdmin(admin.ModelAdmin):
 class PostImageAdmin(admin.ModelAdmin):
     list_display = ['blog_post', 'caption', 'order', 'created_at', 'image_preview']
     list_filter = ['created_at', 'blog_post__category']
+    list_select_related = ['blog_post']
+    autocomplete_fields = ['blog_post']
+    paginator = LargeTablePaginator
+    show_full_result_count = False
     search_fields = ['caption', 'alt_text', 'blog_post__title']
     ordering = ['blog_post', 'order', '-created_at']
     readonly_fields = ['created_at', 'image_preview_large']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer(*BLOG_POST_CONTENT_FIELDS)
+    
     fieldsets = (
         ('Image Details', {
             'fields': ('blog_post', 'image', 'image_preview_large')
@@ -295,6 +355,7 @@ class PostImageAdmin(admin.ModelAdmin):
         })
     )
     
+    @admin.display(description="Preview")
     def image_preview(self, obj):
         if obj.image:
             return format_html(
@@ -302,13 +363,12 @@ class PostImageAdmin(admin.ModelAdmin):
                 obj.image.url
             )
         return "No image"
-    image_preview.short_description = "Preview"
     
+    @admin.display(description="Image Preview")
     def image_preview_large(self, obj):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-height: 300px; max-width: 400px;" />',
                 obj.image.url
             )
-        return "No image uploaded"
-    image_preview_large.short_description = "Image Preview"
\ No newline at end of file
+        return "No image uploaded"
\ No newline at end of file
@@ -6,6 +6,7 @@ class ForumConfig(AppConfig):
     name = "forum"
     
     def ready(self):
-        """Import translation registry when app is ready."""
+        """Import translation registry and signal handlers when app is ready."""
         # This ensures translation.py is loaded before admin.py
         import forum.translation  # noqa
+        import forum.signals  # noqa
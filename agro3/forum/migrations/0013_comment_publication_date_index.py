@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0012_alter_blogpost_content_alter_blogpost_content_en_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['-publication_date'], name='forum_comme_publica_6ac009_idx'),
+        ),
+    ]
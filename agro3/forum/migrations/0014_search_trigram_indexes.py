@@ -0,0 +1,35 @@
+# Adds pg_trgm indexes for the icontains search columns (PostgreSQL only)
+
+from django.db import migrations
+
+from agro_main import trigram
+
+
+# Columns searched with icontains from the forum admin; modeltranslation
+# rewrites 'title' lookups to the active language's title_<lang> column
+SEARCH_COLUMNS = [
+    ('forum_blogpost', 'title'),
+    ('forum_blogpost', 'title_en'),
+    ('forum_blogpost', 'title_ru'),
+    ('forum_blogpost', 'title_ky'),
+    ('forum_comment', 'content'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    trigram.create_trigram_indexes(schema_editor, SEARCH_COLUMNS)
+
+
+def drop_indexes(apps, schema_editor):
+    trigram.drop_trigram_indexes(schema_editor, SEARCH_COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0013_comment_publication_date_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
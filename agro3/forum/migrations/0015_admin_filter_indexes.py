@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0014_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['is_published', '-publication_date'], name='forum_blogp_is_publ_6cd525_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['is_approved', '-publication_date'], name='forum_comme_is_appr_340bb5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postimage',
+            index=models.Index(fields=['blog_post', 'order', 'created_at'], name='forum_posti_blog_po_1b77ff_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0015_admin_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='forum_comme_blog_po_74c8fe_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['author', '-publication_date', 'is_published'], name='forum_blogp_author__d7e22c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['blog_post', 'is_approved', 'parent_comment', 'publication_date'], name='forum_comme_blog_po_1f8dbf_idx'),
+        ),
+    ]
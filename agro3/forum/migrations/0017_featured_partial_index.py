@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0016_thread_and_author_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='forum_blogp_is_feat_187041_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['-publication_date'], name='forum_post_featured_pub_idx'),
+        ),
+    ]
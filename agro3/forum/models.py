@@ -8,11 +8,42 @@ discuss farming topics.
 from django.db import models
 from django.urls import reverse
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 from django.core.validators import FileExtensionValidator
 # Removed django_quill dependency - using simple TextField for content
+import hashlib
 import os
+import re
+from collections import defaultdict
+
+
+# Video ids are 11 URL-safe characters; anything else is not embedded
+YOUTUBE_ID_RE = re.compile(r'(?:youtu\.be/|youtube\.com/(?:watch\?v=|embed/))([\w-]{11})')
+
+# Per-language columns that modeltranslation adds to BlogPost (see translation.py)
+TITLE_FIELDS = {'en': 'title_en', 'ru': 'title_ru', 'ky': 'title_ky'}
+DESCRIPTION_FIELDS = {'en': 'short_description_en', 'ru': 'short_description_ru', 'ky': 'short_description_ky'}
+HTML_FILE_FIELDS = {'en': 'html_file_en', 'ru': 'html_file_ru', 'ky': 'html_file_ky'}
+
+# Extracted HTML keys change with the file, so this only bounds how long unused entries linger
+HTML_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Patterns used to pull the body and head styles out of uploaded HTML documents
+HEAD_RE = re.compile(r'<head[^>]*>(.*?)</head>', re.DOTALL | re.IGNORECASE)
+BODY_RE = re.compile(r'<body[^>]*>(.*?)</body>', re.DOTALL | re.IGNORECASE)
+HTML_RE = re.compile(r'<html[^>]*>(.*?)</html>', re.DOTALL | re.IGNORECASE)
+STYLE_RE = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL | re.IGNORECASE)
+SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+# body/html rules and universal margin/padding resets would fight the site layout
+LAYOUT_STYLE_RES = [
+    re.compile(r'body\s*\{[^}]*\}', re.IGNORECASE),
+    re.compile(r'html\s*\{[^}]*\}', re.IGNORECASE),
+    re.compile(r'\*\s*\{[^}]*margin[^}]*\}', re.IGNORECASE),
+    re.compile(r'\*\s*\{[^}]*padding[^}]*\}', re.IGNORECASE),
+]
 
 
 class Category(models.Model):
@@ -156,9 +187,16 @@ class BlogPost(models.Model):
         ordering = ['-publication_date']
         indexes = [
             models.Index(fields=['-publication_date', 'is_published']),
+            models.Index(fields=['is_published', '-publication_date']),
             models.Index(fields=['slug']),
             models.Index(fields=['category', '-publication_date']),
-            models.Index(fields=['is_featured', 'is_published']),
+            # Featured posts are a handful of rows; index only those, in display order
+            models.Index(
+                fields=['-publication_date'],
+                name='forum_post_featured_pub_idx',
+                condition=models.Q(is_published=True, is_featured=True),
+            ),
+            models.Index(fields=['author', '-publication_date', 'is_published']),
         ]
     
     def __str__(self):
@@ -174,66 +212,35 @@ class BlogPost(models.Model):
     
     def get_title_for_language(self, language_code='en'):
         """Get title for specific language, falling back to default title."""
-        if language_code == 'ru' and hasattr(self, 'title_ru') and self.title_ru:
-            return self.title_ru
-        elif language_code == 'ky' and hasattr(self, 'title_ky') and self.title_ky:
-            return self.title_ky
-        elif language_code == 'en' and hasattr(self, 'title_en') and self.title_en:
-            return self.title_en
-        return self.title  # Fallback to default title
+        return getattr(self, TITLE_FIELDS.get(language_code, 'title')) or self.title
     
     def get_description_for_language(self, language_code='en'):
         """Get description for specific language, falling back to default description."""
-        if language_code == 'ru' and hasattr(self, 'short_description_ru') and self.short_description_ru:
-            return self.short_description_ru
-        elif language_code == 'ky' and hasattr(self, 'short_description_ky') and self.short_description_ky:
-            return self.short_description_ky
-        elif language_code == 'en' and hasattr(self, 'short_description_en') and self.short_description_en:
-            return self.short_description_en
-        return self.short_description  # Fallback to default description
-    
-    def get_html_file_for_language(self, language_code='en'):
-        """Get HTML file for specific language, falling back to default file."""
-        if language_code == 'ru' and hasattr(self, 'html_file_ru') and self.html_file_ru:
-            return self.html_file_ru
-        elif language_code == 'ky' and hasattr(self, 'html_file_ky') and self.html_file_ky:
-            return self.html_file_ky
-        return self.html_file  # Fallback to default HTML file
+        return getattr(self, DESCRIPTION_FIELDS.get(language_code, 'short_description')) or self.short_description
     
     def has_translation(self, language_code):
         """Check if post has content in specific language."""
-        if language_code == 'ru':
-            html_file_ru = getattr(self, 'html_file_ru', None)
-            title_ru = getattr(self, 'title_ru', None)
-            return bool(html_file_ru or title_ru)
-        elif language_code == 'ky':
-            html_file_ky = getattr(self, 'html_file_ky', None)
-            title_ky = getattr(self, 'title_ky', None)
-            return bool(html_file_ky or title_ky)
-        elif language_code == 'en':
-            html_file_en = getattr(self, 'html_file_en', self.html_file)
-            title_en = getattr(self, 'title_en', self.title)
-            return bool(html_file_en or title_en)
-        return False
+        if language_code not in TITLE_FIELDS:
+            return False
+        return bool(getattr(self, HTML_FILE_FIELDS[language_code]) or getattr(self, TITLE_FIELDS[language_code]))
     
     def get_comment_count(self):
         return self.comments.filter(is_approved=True).count()
     
     def get_youtube_embed_id(self):
         """Extract YouTube video ID from URL for embedding"""
+        return self._youtube_embed_id
+    
+    @cached_property
+    def _youtube_embed_id(self):
+        # Parsed once per instance; handles youtu.be/<id>, youtube.com/watch?v=<id>
+        # and youtube.com/embed/<id>
         if not self.youtube_url:
             return None
-        
-        # Handle different YouTube URL formats
-        url = self.youtube_url
-        if 'youtu.be/' in url:
-            return url.split('youtu.be/')[1].split('?')[0]
-        elif 'youtube.com/watch?v=' in url:
-            return url.split('v=')[1].split('&')[0]
-        elif 'youtube.com/embed/' in url:
-            return url.split('embed/')[1].split('?')[0]
-        return None
+        match = YOUTUBE_ID_RE.search(self.youtube_url)
+        return match.group(1) if match else None
     
+    @cached_property
     def has_video(self):
         """Check if post has any video content"""
         return bool(self.featured_video or self.youtube_url)
@@ -242,16 +249,32 @@ class BlogPost(models.Model):
         """Get the main image for display - featured image or first additional image"""
         if self.featured_image:
             return self.featured_image
-        first_image = self.images.first()
+        if 'images' in getattr(self, '_prefetched_objects_cache', {}):
+            # Reuse prefetch_related('images') rather than querying per post
+            first_image = next(iter(self.images.all()), None)
+        else:
+            first_image = self.images.first()
         return first_image.image if first_image else None
     
     def get_gallery_images(self):
         """Get all additional images for gallery display"""
-        return self.images.all().order_by('order', 'created_at')
+        # PostImage.Meta.ordering is (order, created_at), so prefetched images are reused as-is
+        return self.images.all()
     
     def get_threaded_comments(self):
-        """Get all top-level comments with their replies in a tree structure"""
-        return self.comments.filter(is_approved=True, parent_comment=None).prefetch_related('replies')
+        """
+        Get all top-level comments with their replies in a tree structure.
+
+        The post's approved comments are loaded in one query; every comment gets
+        an approved_replies list of its direct replies, at any depth.
+        """
+        comments = list(self.comments.filter(is_approved=True).select_related('author__profile'))
+        replies_by_parent = defaultdict(list)
+        for comment in comments:
+            replies_by_parent[comment.parent_comment_id].append(comment)
+        for comment in comments:
+            comment.approved_replies = replies_by_parent[comment.pk]
+        return replies_by_parent[None]
     
     def get_like_count(self):
         """Get total number of likes for this post"""
@@ -284,15 +307,12 @@ class BlogPost(models.Model):
     
     def get_html_file_for_language(self, language_code='en'):
         """Get the appropriate HTML file based on language preference"""
-        if language_code == 'ru' and hasattr(self, 'html_file_ru') and self.html_file_ru:
-            return self.html_file_ru
-        elif language_code == 'ky' and hasattr(self, 'html_file_ky') and self.html_file_ky:
-            return self.html_file_ky
-        elif hasattr(self, 'html_file_en') and self.html_file_en:
-            return self.html_file_en
-        elif self.html_file:
-            return self.html_file
-        return None
+        if language_code in ('ru', 'ky'):
+            html_file = getattr(self, HTML_FILE_FIELDS[language_code])
+            if html_file:
+                return html_file
+        # Other languages fall back to the English file, then the default one
+        return self.html_file_en or self.html_file or None
     
     def get_html_content_for_language(self, language_code='en'):
         """Get HTML content for specific language, extracting only body content"""
@@ -304,61 +324,92 @@ class BlogPost(models.Model):
         _, styles = self.get_html_and_styles_for_language(language_code)
         return styles
     
+    def html_cache_key(self, language_code, html_file):
+        """
+        Cache key for the body and styles extracted from html_file.
+
+        Falls back to a key on the name alone when the storage can't report
+        the file's size (a missing file, or a remote backend error).
+        """
+        name_digest = hashlib.md5(html_file.name.encode(), usedforsecurity=False).hexdigest()
+        try:
+            size = html_file.size
+        except Exception:
+            size = ''
+        return f'forum:post_html:{self.pk}:{language_code}:{name_digest}:{size}'
+    
+    def clear_html_cache(self):
+        """Drop the cached extraction of the post's current HTML file in every language"""
+        cache_keys = []
+        for language_code, _ in settings.LANGUAGES:
+            html_file = self.get_html_file_for_language(language_code)
+            if html_file:
+                cache_keys.append(self.html_cache_key(language_code, html_file))
+        cache.delete_many(cache_keys)
+    
     def get_html_and_styles_for_language(self, language_code='en'):
-        """Get both HTML content and CSS styles for specific language in one read"""
+        """
+        Get both HTML content and CSS styles for specific language in one read.
+
+        The result is cached under html_cache_key(), which changes with the
+        file's name and size; saving or deleting the post also drops it.
+        """
         html_file = self.get_html_file_for_language(language_code)
         if html_file:
             try:
-                content = html_file.read().decode('utf-8')
-                html_file.close()
+                cache_key = self.html_cache_key(language_code, html_file)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                
+                # FieldFile.open() takes no encoding, so decode the bytes here
+                with html_file.open('rb') as f:
+                    content = f.read().decode('utf-8')
                 
                 # If this is a complete HTML document, extract body content and styles
                 if '<!DOCTYPE html>' in content or '<html' in content:
-                    import re
-                    
                     # Extract styles from head section
                     extracted_styles = None
-                    head_match = re.search(r'<head[^>]*>(.*?)</head>', content, re.DOTALL | re.IGNORECASE)
+                    head_match = HEAD_RE.search(content)
                     if head_match:
-                        head_content = head_match.group(1)
-                        style_matches = re.findall(r'<style[^>]*>(.*?)</style>', head_content, re.DOTALL | re.IGNORECASE)
+                        style_matches = STYLE_RE.findall(head_match.group(1))
                         if style_matches:
                             # Combine all styles
                             combined_styles = '\n'.join(style_matches)
                             # Remove problematic styles that interfere with our layout
-                            combined_styles = re.sub(r'body\s*\{[^}]*\}', '', combined_styles, flags=re.IGNORECASE)
-                            combined_styles = re.sub(r'html\s*\{[^}]*\}', '', combined_styles, flags=re.IGNORECASE)
-                            # Remove any margin/padding on universal selectors that might break layout
-                            combined_styles = re.sub(r'\*\s*\{[^}]*margin[^}]*\}', '', combined_styles, flags=re.IGNORECASE)
-                            combined_styles = re.sub(r'\*\s*\{[^}]*padding[^}]*\}', '', combined_styles, flags=re.IGNORECASE)
+                            for pattern in LAYOUT_STYLE_RES:
+                                combined_styles = pattern.sub('', combined_styles)
                             
                             extracted_styles = combined_styles.strip() if combined_styles.strip() else None
                     
                     # Extract content between <body> tags
                     body_content = ""
-                    body_match = re.search(r'<body[^>]*>(.*?)</body>', content, re.DOTALL | re.IGNORECASE)
+                    body_match = BODY_RE.search(content)
                     if body_match:
                         body_content = body_match.group(1).strip()
                         
                         # Remove any existing style tags from body (we already extracted them from head)
-                        body_content = re.sub(r'<style[^>]*>.*?</style>', '', body_content, flags=re.DOTALL | re.IGNORECASE)
+                        body_content = STYLE_RE.sub('', body_content)
                         
                         # Remove any script tags that might cause issues
-                        body_content = re.sub(r'<script[^>]*>.*?</script>', '', body_content, flags=re.DOTALL | re.IGNORECASE)
+                        body_content = SCRIPT_RE.sub('', body_content)
                     else:
                         # If no body tag found, try to extract content inside html tag
-                        html_match = re.search(r'<html[^>]*>(.*?)</html>', content, re.DOTALL | re.IGNORECASE)
+                        html_match = HTML_RE.search(content)
                         if html_match:
                             body_content = html_match.group(1)
                             # Remove head section
-                            body_content = re.sub(r'<head[^>]*>.*?</head>', '', body_content, flags=re.DOTALL | re.IGNORECASE)
+                            body_content = HEAD_RE.sub('', body_content)
                             # Remove any remaining style tags
-                            body_content = re.sub(r'<style[^>]*>.*?</style>', '', body_content, flags=re.DOTALL | re.IGNORECASE)
+                            body_content = STYLE_RE.sub('', body_content)
                     
-                    return body_content.strip(), extracted_styles
+                    result = body_content.strip(), extracted_styles
                 else:
                     # If it's just HTML fragments, return as is with no styles
-                    return content, None
+                    result = content, None
+                
+                cache.set(cache_key, result, HTML_CACHE_TIMEOUT)
+                return result
                     
             except Exception as e:
                 import logging
@@ -409,8 +460,11 @@ class Comment(models.Model):
     class Meta:
         ordering = ['publication_date']
         indexes = [
-            models.Index(fields=['blog_post', 'is_approved', 'parent_comment']),
+            # Thread listings filter on the first three and sort on publication_date
+            models.Index(fields=['blog_post', 'is_approved', 'parent_comment', 'publication_date']),
             models.Index(fields=['author', '-publication_date']),
+            models.Index(fields=['-publication_date']),
+            models.Index(fields=['is_approved', '-publication_date']),
         ]
     
     def __str__(self):
@@ -425,35 +479,66 @@ class Comment(models.Model):
     def get_reply_count(self):
         return self.replies.filter(is_approved=True).count()
     
+    @cached_property
+    def approved_replies(self):
+        # BlogPost.get_threaded_comments() sets this for a whole thread at once;
+        # comments loaded any other way fall back to a query for their replies
+        return list(self.replies.filter(is_approved=True))
+    
+    def get_ancestor_ids(self):
+        """Get the ids of this comment's parents, nearest first, from one query"""
+        if not self.parent_comment_id:
+            return []
+        parent_ids = dict(
+            Comment.objects.filter(blog_post_id=self.blog_post_id).values_list('pk', 'parent_comment_id')
+        )
+        ancestor_ids = []
+        comment_id = self.parent_comment_id
+        while comment_id:
+            ancestor_ids.append(comment_id)
+            comment_id = parent_ids.get(comment_id)
+        return ancestor_ids
+    
     def get_thread_depth(self):
         """Calculate the depth of this comment in the thread"""
-        depth = 0
-        parent = self.parent_comment
-        while parent:
-            depth += 1
-            parent = parent.parent_comment
-        return depth
+        return len(self.get_ancestor_ids())
     
     def get_root_comment(self):
         """Get the top-level comment of this thread"""
-        if not self.parent_comment:
+        ancestor_ids = self.get_ancestor_ids()
+        if not ancestor_ids:
             return self
-        parent = self.parent_comment
-        while parent.parent_comment:
-            parent = parent.parent_comment
-        return parent
+        return Comment.objects.get(pk=ancestor_ids[-1])
     
-    def get_all_descendants(self):
-        """Get all nested replies recursively"""
+    def get_all_descendants(self, replies=None):
+        """
+        Get all nested replies depth-first, each level in publication order.
+
+        The post's approved replies are fetched in one query and the thread is
+        walked in Python; replies under an unapproved comment are left out.
+        """
+        if replies is None:
+            replies = Comment.objects.filter(
+                blog_post_id=self.blog_post_id, is_approved=True, parent_comment__isnull=False
+            )
+        replies_by_parent = defaultdict(list)
+        for reply in replies:
+            replies_by_parent[reply.parent_comment_id].append(reply)
+
         descendants = []
-        for reply in self.replies.filter(is_approved=True):
+        stack = replies_by_parent[self.pk][::-1]
+        while stack:
+            reply = stack.pop()
             descendants.append(reply)
-            descendants.extend(reply.get_all_descendants())
+            stack.extend(replies_by_parent[reply.pk][::-1])
         return descendants
-    
+
     def get_thread_total_replies(self):
         """Get total number of replies in the entire thread"""
-        return len(self.get_all_descendants())
+        replies = Comment.objects.filter(
+            blog_post_id=self.blog_post_id, is_approved=True, parent_comment__isnull=False
+        ).only('pk', 'parent_comment_id')
+        return len(self.get_all_descendants(replies))
     
     def get_like_count(self):
         """Get total number of likes for this comment"""
@@ -485,6 +570,9 @@ class PostImage(models.Model):
     
     class Meta:
         ordering = ['order', 'created_at']
+        indexes = [
+            models.Index(fields=['blog_post', 'order', 'created_at']),
+        ]
     
     def __str__(self):
         return f'Image for {self.blog_post.title}'
@@ -0,0 +1,30 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class LargeTablePaginator(Paginator):
+    """
+    Admin paginator that avoids COUNT(*) on big, unfiltered tables.
+
+    On PostgreSQL the planner's row estimate from pg_class is used when the
+    changelist is unfiltered and the table holds more than ESTIMATE_THRESHOLD
+    rows; page links past the true end simply come back empty. Smaller or
+    filtered result sets, and other databases, get an exact count.
+    """
+    ESTIMATE_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.ESTIMATE_THRESHOLD:
+                return int(row[0])
+        return super().count
@@ -0,0 +1,18 @@
+import logging
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import BlogPost
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def invalidate_post_html_cache(sender, instance, **kwargs):
+    """Drop the post's cached HTML extraction so edits show up immediately"""
+    # A cache or storage outage must not make saving or deleting the post fail
+    try:
+        instance.clear_html_cache()
+    except Exception as e:
+        logger.warning(f"Could not clear cached HTML for post {instance.pk}: {e}")
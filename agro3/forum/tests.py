@@ -1,3 +1,201 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import FieldFile
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import BlogPost, Category, Comment, Like, PostImage
+
+
+class CommentThreadTests(TestCase):
+    """Tests for walking nested comment replies."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='farmer', password='secret')
+        self.post = BlogPost.objects.create(title='Wheat rust', author=self.user, content='<p>Rust</p>')
+        self.start = timezone.now()
+        self.root = self.comment()
+
+    def comment(self, parent=None, content='Reply', **kwargs):
+        # Spread publication dates so reply order is deterministic
+        self.start += timedelta(minutes=1)
+        return Comment.objects.create(
+            blog_post=self.post, author=self.user, parent_comment=parent,
+            content=content, publication_date=self.start, **kwargs
+        )
+
+    def test_descendants_are_depth_first_and_approved_only(self):
+        """Test that the thread is walked depth-first and skips unapproved branches."""
+        first = self.comment(self.root)
+        nested = self.comment(first)
+        second = self.comment(self.root)
+        hidden = self.comment(self.root, is_approved=False)
+        self.comment(hidden)
+        self.comment()  # a separate thread on the same post
+
+        with self.assertNumQueries(1):
+            descendants = self.root.get_all_descendants()
+        self.assertEqual(descendants, [first, nested, second])
+        self.assertEqual(first.get_all_descendants(), [nested])
+        self.assertEqual(self.root.get_thread_total_replies(), 3)
+
+    def test_depth_and_root_come_from_one_walk(self):
+        """Test that a reply's depth and root are found without per-level queries."""
+        nested = self.comment(self.comment(self.comment(self.root)))
+        nested = Comment.objects.get(pk=nested.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(nested.get_thread_depth(), 3)
+        with self.assertNumQueries(2):
+            self.assertEqual(nested.get_root_comment(), self.root)
+        self.assertEqual(self.root.get_thread_depth(), 0)
+        self.assertEqual(self.root.get_root_comment(), self.root)
+
+    def test_threaded_comments_attach_approved_replies(self):
+        """Test that the whole approved tree is built from one query."""
+        first = self.comment(self.root)
+        nested = self.comment(first)
+        self.comment(self.root, is_approved=False)
+        other_root = self.comment()
+
+        with self.assertNumQueries(1):
+            roots = self.post.get_threaded_comments()
+            self.assertEqual(roots, [self.root, other_root])
+            self.assertEqual(roots[0].approved_replies, [first])
+            replies = roots[0].approved_replies[0].approved_replies
+            self.assertEqual(replies, [nested])
+            self.assertEqual(replies[0].approved_replies, [])
+
+    def test_comment_template_renders_replies_without_threading(self):
+        """Test that the comment template also renders replies of a directly loaded comment."""
+        self.comment(self.comment(self.root, content='Nested reply'))
+        self.comment(self.root, content='Hidden reply', is_approved=False)
+
+        for root in [Comment.objects.get(pk=self.root.pk), self.post.get_threaded_comments()[0]]:
+            html = render_to_string('forum/includes/threaded_comment.html', {'comment': root, 'depth': 0})
+            self.assertIn('Nested reply', html)
+            self.assertNotIn('Hidden reply', html)
+
+
+class BlogPostHelperTests(TestCase):
+    """Tests for BlogPost's language and media helpers."""
+
+    def test_html_file_falls_back_to_english(self):
+        """Test that a missing translation falls back to the English file."""
+        post = BlogPost(title='Irrigation', html_file_en='blog/html/en.html', html_file_ky='blog/html/ky.html')
+        self.assertEqual(post.get_html_file_for_language('ky').name, 'blog/html/ky.html')
+        self.assertEqual(post.get_html_file_for_language('ru').name, 'blog/html/en.html')
+        self.assertEqual(post.get_html_file_for_language('fr').name, 'blog/html/en.html')
+        self.assertIsNone(BlogPost(title='Empty').get_html_file_for_language('ru'))
+
+    def test_youtube_embed_id(self):
+        """Test that the video id is found in each supported URL shape."""
+        for url in [
+            'https://youtu.be/dQw4w9WgXcQ?si=share',
+            'https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42',
+            'https://www.youtube.com/embed/dQw4w9WgXcQ',
+        ]:
+            self.assertEqual(BlogPost(youtube_url=url).get_youtube_embed_id(), 'dQw4w9WgXcQ')
+        self.assertIsNone(BlogPost(youtube_url='https://vimeo.com/123').get_youtube_embed_id())
+
+    def test_prefetched_images_are_reused(self):
+        """Test that the image helpers read prefetched images without querying."""
+        user = User.objects.create_user(username='farmer', password='secret')
+        post = BlogPost.objects.create(title='Orchard', author=user, content='<p>Apples</p>')
+        second = PostImage.objects.create(blog_post=post, image='blog/posts/orchard/2.jpg', order=2)
+        first = PostImage.objects.create(blog_post=post, image='blog/posts/orchard/1.jpg', order=1)
+
+        post = BlogPost.objects.prefetch_related('images').get(pk=post.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(post.get_primary_image(), first.image)
+            self.assertEqual(list(post.get_gallery_images()), [first, second])
+
+
+class PostHtmlCacheTests(TestCase):
+    """Tests for caching the HTML extracted from uploaded post files."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(cache.clear)  # keys reuse pks and file names across tests
+
+        user = User.objects.create_user(username='farmer', password='secret')
+        self.post = BlogPost.objects.create(title='Soil tests', author=user)
+        self.post.html_file_en.save('soil.html', ContentFile(self.document('old')))
+
+    def document(self, text):
+        return f'<html><head><style>.{text}{{}}</style></head><body><p>{text}</p></body></html>'.encode()
+
+    def replace_file(self, text):
+        """Overwrite the stored file in place, keeping its name"""
+        with open(self.post.html_file_en.path, 'wb') as f:
+            f.write(self.document(text))
+
+    def test_replaced_file_is_not_served_from_cache(self):
+        """Test that a new file under the same name bypasses the old cache entry."""
+        self.assertEqual(self.post.get_html_and_styles_for_language('en'), ('<p>old</p>', '.old{}'))
+        self.replace_file('newer')
+        self.assertEqual(self.post.get_html_and_styles_for_language('en'), ('<p>newer</p>', '.newer{}'))
+
+    def test_saving_the_post_clears_the_cache(self):
+        """Test that saving the post drops the entry even when name and size match."""
+        self.post.get_html_and_styles_for_language('en')
+        self.replace_file('new')
+        self.post.save()
+        self.assertEqual(self.post.get_html_and_styles_for_language('en'), ('<p>new</p>', '.new{}'))
+
+    def test_storage_errors_do_not_break_saving(self):
+        """Test that a storage backend failing to report the size can't stop a save or delete."""
+        self.post.get_html_and_styles_for_language('en')
+        size = mock.PropertyMock(side_effect=RuntimeError('storage unavailable'))
+        with mock.patch.object(FieldFile, 'size', new_callable=lambda: size):
+            self.post.save()
+            self.post.delete()
+
+
+class PostListCountTests(TestCase):
+    """Tests for the comment and like totals on post lists."""
+
+    def test_category_list_annotates_totals(self):
+        """Test that each listed post carries its approved comment and like totals."""
+        user = User.objects.create_user(username='farmer', password='secret')
+        category = Category.objects.create(name='Pests')
+        post = BlogPost.objects.create(title='Aphids', author=user, category=category, content='<p>Aphids</p>')
+        BlogPost.objects.create(title='Locusts', author=user, category=category, content='<p>Locusts</p>')
+        Comment.objects.create(blog_post=post, author=user, content='Seen them')
+        Comment.objects.create(blog_post=post, author=user, content='Spam', is_approved=False)
+        Like.objects.create(user=user, blog_post=post)
+
+        response = self.client.get(reverse('forum:category', kwargs={'slug': category.slug}))
+        self.assertEqual(response.status_code, 200)
+        totals = {p.title: (p.comment_total, p.like_total) for p in response.context['posts']}
+        self.assertEqual(totals, {'Aphids': (1, 1), 'Locusts': (0, 0)})
+
+
+class PostDetailTests(TestCase):
+    """Tests for the post detail page."""
+
+    def test_view_count_is_incremented_in_the_database(self):
+        """Test that each view adds one to the stored count without a stale overwrite."""
+        user = User.objects.create_user(username='farmer', password='secret')
+        post = BlogPost.objects.create(title='Drip lines', author=user, content='<p>Drip</p>')
+        url = reverse('forum:post_detail', kwargs={'slug': post.slug})
+
+        self.client.get(url)
+        BlogPost.objects.filter(pk=post.pk).update(views_count=10)  # e.g. another worker's views
+        response = self.client.get(url)
+
+        self.assertEqual(response.context['post'].views_count, 11)
+        post.refresh_from_db()
+        self.assertEqual(post.views_count, 11)
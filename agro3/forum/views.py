@@ -9,13 +9,31 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import F, Func, OuterRef, Q, Subquery
 from django.http import JsonResponse
 from django import forms
 # Removed django_quill dependency
 from .models import BlogPost, Category, Tag, Comment, Like
 
 
+def row_count(queryset):
+    """Correlated subquery that counts queryset's rows (0 when there are none)"""
+    return Subquery(queryset.order_by().values(total=Func('pk', function='COUNT')))
+
+
+def with_post_counts(posts):
+    """
+    Annotate comment_total and like_total for post list templates.
+
+    Subqueries rather than Count() joins, so comments and likes never multiply
+    each other's rows, and only the page being rendered gets counted.
+    """
+    return posts.annotate(
+        comment_total=row_count(Comment.objects.filter(blog_post=OuterRef('pk'), is_approved=True)),
+        like_total=row_count(Like.objects.filter(blog_post=OuterRef('pk'))),
+    )
+
+
 def blog_index_view(request):
     """Display all published blog posts with search and filtering."""
     posts = BlogPost.objects.filter(is_published=True).select_related('author', 'category').prefetch_related('tags')
@@ -74,14 +92,13 @@ def blog_post_detail_view(request, slug):
     """Display a single blog post using uploaded HTML file content."""
     post = get_object_or_404(BlogPost, slug=slug, is_published=True)
     
-    # Increment view count
+    # Increment view count in the database, so concurrent views are not lost
+    BlogPost.objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
     post.views_count += 1
-    post.save(update_fields=['views_count'])
     
     # Get HTML content and styles for current language
     current_language = getattr(request, 'LANGUAGE_CODE', 'en')
-    html_content = post.get_html_content_for_language(current_language)
-    extracted_styles = post.get_extracted_styles_for_language(current_language)
+    html_content, extracted_styles = post.get_html_and_styles_for_language(current_language)
     
     context = {
         'post': post,
@@ -107,10 +124,10 @@ def blog_category_list_view(request, slug):
         Paginated list of posts in the specified category
     """
     category = get_object_or_404(Category, slug=slug)
-    posts = BlogPost.objects.filter(
+    posts = with_post_counts(BlogPost.objects.filter(
         is_published=True,
         category=category
-    ).select_related('author').prefetch_related('tags')
+    ).select_related('author').prefetch_related('tags'))
     
     # Pagination
     paginator = Paginator(posts, 10)
@@ -140,10 +157,10 @@ def blog_tag_list_view(request, slug):
         Paginated list of posts with the specified tag
     """
     tag = get_object_or_404(Tag, slug=slug)
-    posts = BlogPost.objects.filter(
+    posts = with_post_counts(BlogPost.objects.filter(
         is_published=True,
         tags=tag
-    ).select_related('author', 'category').prefetch_related('tags')
+    ).select_related('author', 'category').prefetch_related('tags'))
     
     # Pagination
     paginator = Paginator(posts, 10)